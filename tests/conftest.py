@@ -0,0 +1,35 @@
+"""
+測試共用設定：v3.4.6.py 的檔名含有點，無法直接 import，改以檔案路徑載入為模組。
+缺少任何執行程式所需的函式庫時略過測試。
+"""
+import importlib.util
+import os
+import pathlib
+
+import pytest
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+APP_PATH = pathlib.Path(__file__).resolve().parent.parent / "v3.4.6.py"
+
+
+@pytest.fixture(scope="session")
+def graph():
+    for name in ("numpy", "pandas", "matplotlib", "PySide6"):
+        pytest.importorskip(name)
+    spec = importlib.util.spec_from_file_location("graph_app", APP_PATH)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+@pytest.fixture
+def window(graph):
+    """ 新建的主視窗 (offscreen)；QApplication 在整個測試過程中只建立一次。 """
+    from PySide6.QtWidgets import QApplication
+    app = QApplication.instance() or QApplication([])
+    win = graph.PlottingApp()
+    yield win
+    win.close()
+    win.deleteLater()
+    app.processEvents()
@@ -0,0 +1,60 @@
+""" minmax_indices 折線抽樣的測試。 """
+import pytest
+
+np = pytest.importorskip("numpy")
+
+
+def bucket_extremes(y, lo, size, n_buckets):
+    """ 以 nanargmin/nanargmax 逐段計算應保留的索引 (全為 NaN 的區段略過)。 """
+    expected = set()
+    for b in range(n_buckets):
+        seg = y[lo + b * size:lo + (b + 1) * size]
+        if np.isnan(seg).all():
+            continue
+        expected.update((lo + b * size + int(np.nanargmin(seg)), lo + b * size + int(np.nanargmax(seg))))
+    return expected
+
+
+def test_keeps_bucket_extremes(graph):
+    rng = np.random.default_rng(0)
+    x, y = np.arange(1000.0), rng.normal(size=1000)
+    kept = graph.minmax_indices(x, y, x[0], x[-1], 10)
+    assert bucket_extremes(y, 0, 100, 10) <= set(kept.tolist())
+    assert kept[0] == 0 and kept[-1] == 999
+    assert np.all(np.diff(kept) > 0)
+
+
+def test_short_range_is_not_decimated(graph):
+    x = np.arange(30.0)
+    assert np.array_equal(graph.minmax_indices(x, x, x[0], x[-1], 10), np.arange(30))
+
+
+def test_nan_does_not_hide_extremes(graph):
+    x, y = np.arange(1000.0), np.zeros(1000)
+    y[5], y[3], y[7] = np.nan, -50.0, 50.0
+    y[250:260] = np.nan
+    y[255 - 10], y[265] = 80.0, -80.0
+    y[500:600] = np.nan
+    kept = set(graph.minmax_indices(x, y, x[0], x[-1], 10).tolist())
+    assert bucket_extremes(y, 0, 100, 10) <= kept
+    assert {3, 7, 245, 265} <= kept
+    # 每個含 NaN 的區段保留第一個 NaN，折線在缺值處斷開
+    assert {5, 250, 500} <= kept
+
+
+def test_leftover_tail_is_kept(graph):
+    # 1005 點分成 10 段每段 100 點，剩下的 5 點不屬於任何區段，必須全部保留
+    x, y = np.arange(1005.0), np.zeros(1005)
+    y[1002] = 99.0
+    y[1003] = np.nan
+    kept = graph.minmax_indices(x, y, x[0], x[-1], 10)
+    assert set(range(1000, 1005)) <= set(kept.tolist())
+    assert kept.dtype.kind == 'i'
+
+
+def test_range_limits_with_margin(graph):
+    x, y = np.arange(10000.0), np.sin(np.arange(10000.0))
+    kept = graph.minmax_indices(x, y, 2000.0, 3000.0, 10)
+    # 範圍外各多保留一點
+    assert kept[0] == 1999 and kept[-1] == 3001
+    assert bucket_extremes(y, 1999, (3002 - 1999) // 10, 10) <= set(kept.tolist())
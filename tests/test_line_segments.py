@@ -0,0 +1,46 @@
+""" line_segments 的測試，與原本先取出抽樣點再以 np.stack 組成線段的結果比較。 """
+import pytest
+
+np = pytest.importorskip("numpy")
+
+
+def stacked_segments(points, seg_colors, kept=None):
+    """ 原本的實作。 """
+    if kept is not None:
+        points, seg_colors = points[kept], seg_colors[kept[:-1]]
+    return np.stack([points[:-1], points[1:]], axis=1), seg_colors
+
+
+def make_line(n):
+    rng = np.random.default_rng(n)
+    points = rng.normal(size=(n, 2))
+    seg_colors = rng.random(size=(max(n - 1, 0), 4))
+    return points, seg_colors
+
+
+@pytest.mark.parametrize('n', [0, 1, 2, 50])
+def test_full_line_matches_stack(graph, n):
+    points, seg_colors = make_line(n)
+    segments, colors = graph.line_segments(points, seg_colors)
+    expected_segments, expected_colors = stacked_segments(points, seg_colors)
+    assert segments.shape == (max(n - 1, 0), 2, 2)
+    np.testing.assert_array_equal(segments, expected_segments)
+    np.testing.assert_array_equal(colors, expected_colors)
+
+
+@pytest.mark.parametrize('kept', [[], [3], [0, 49], [0, 4, 5, 17, 30, 49]])
+def test_decimated_line_matches_stack(graph, kept):
+    points, seg_colors = make_line(50)
+    kept = np.array(kept, dtype=np.intp)
+    segments, colors = graph.line_segments(points, seg_colors, kept)
+    expected_segments, expected_colors = stacked_segments(points, seg_colors, kept)
+    assert segments.shape == (max(len(kept) - 1, 0), 2, 2)
+    np.testing.assert_array_equal(segments, expected_segments)
+    np.testing.assert_array_equal(colors, expected_colors)
+
+
+def test_segments_do_not_share_memory_with_points(graph):
+    """ LineCollection 保留線段陣列的 view，線段不可與點座標共用記憶體 """
+    points, seg_colors = make_line(10)
+    segments, _ = graph.line_segments(points, seg_colors)
+    assert not np.shares_memory(segments, points)
@@ -0,0 +1,53 @@
+""" to_numeric_column 的測試，與原本只用 pd.to_numeric 逐項判斷的結果比較。 """
+import pytest
+
+np = pytest.importorskip("numpy")
+pd = pytest.importorskip("pandas")
+
+
+def coerce_column(values):
+    """ 原本的實作：以 pd.to_numeric 轉換，無法轉換的項目保留原字串。 """
+    values = np.asarray(values, dtype=object)
+    numeric = pd.to_numeric(pd.Series(values), errors='coerce').to_numpy(dtype=float, na_value=np.nan)
+    missing = np.isnan(numeric)
+    if not missing.any():
+        return numeric
+    return np.where(missing, values, numeric.astype(object)).tolist()
+
+
+CASES = {
+    'all_numeric': ['1', '2.5', '-3', '1e3', ' 4 '],
+    'infinity': ['inf', '-Infinity', '1'],
+    'mixed_text': ['1', 'abc', '2.5', ''],
+    'nan_text': ['1', 'nan', 'NaN', '2'],
+    'empty_strings': ['', ''],
+    'underscore': ['1_000', '2'],
+    'fullwidth_digits': ['１２', '3'],
+    'hex': ['0x10', '1'],
+    'none': [None, '1'],
+    'python_numbers': [3, 2.5, '1'],
+}
+
+
+@pytest.mark.parametrize('case', sorted(CASES))
+def test_matches_pd_to_numeric(graph, case):
+    expected = coerce_column(CASES[case])
+    result = graph.to_numeric_column(CASES[case])
+    assert type(result) is type(expected)
+    if isinstance(expected, np.ndarray):
+        assert result.dtype == np.float64
+        np.testing.assert_array_equal(result, expected)
+    else:
+        assert len(result) == len(expected)
+        for got, want in zip(result, expected):
+            assert type(got) is type(want) and (got == want or (got is None and want is None))
+
+
+def test_all_numeric_returns_float_array(graph):
+    result = graph.to_numeric_column(np.array(['1', '2', '3'], dtype=object))
+    assert isinstance(result, np.ndarray) and result.dtype == np.float64
+    np.testing.assert_array_equal(result, [1.0, 2.0, 3.0])
+
+
+def test_nan_text_is_kept(graph):
+    assert graph.to_numeric_column(['1', 'nan']) == [1.0, 'nan']
@@ -0,0 +1,76 @@
+""" 平滑曲線前處理 (aggregate_duplicate_x、compute_smooth_curve) 的測試，與原本以 np.unique 合併的結果比較。 """
+import pytest
+
+np = pytest.importorskip("numpy")
+
+
+def unique_aggregate(x, y):
+    """ 原本的實作：排序後以 np.unique 找出重複的 x，y 取平均。 """
+    order = np.argsort(x)
+    sorted_x, sorted_y = x[order], y[order]
+    unique_x, unique_indices, counts = np.unique(sorted_x, return_index=True, return_counts=True)
+    if len(unique_x) == len(sorted_x):
+        return sorted_x, sorted_y
+    return unique_x, np.add.reduceat(sorted_y, unique_indices) / counts
+
+
+def sorted_aggregate(graph, x, y, with_diffs):
+    order = np.argsort(x, kind='stable')
+    sorted_x, sorted_y = x[order], y[order]
+    diffs = np.diff(sorted_x) if with_diffs else None
+    return graph.aggregate_duplicate_x(sorted_x, sorted_y, diffs)
+
+
+CASES = {
+    'no_duplicates': (np.array([0.0, 1.0, 2.5, 4.0]), np.array([1.0, 2.0, 3.0, 4.0])),
+    'unsorted_duplicates': (np.array([3.0, 1.0, 2.0, 1.0, 3.0, 3.0, 0.5]), np.array([1.0, 2.0, 3.0, 4.0, 5.0, 6.0, 7.0])),
+    'all_duplicates': (np.full(6, 2.0), np.arange(6.0)),
+    'nan_x': (np.array([1.0, np.nan, 0.0, np.nan, 1.0, 2.0]), np.array([1.0, 2.0, 3.0, 4.0, 5.0, 6.0])),
+    'single_point': (np.array([1.0]), np.array([5.0])),
+}
+
+
+@pytest.mark.parametrize('with_diffs', [False, True])
+@pytest.mark.parametrize('case', sorted(CASES))
+def test_matches_np_unique(graph, case, with_diffs):
+    x, y = CASES[case]
+    expected_x, expected_y = unique_aggregate(x, y)
+    final_x, final_y = sorted_aggregate(graph, x, y, with_diffs)
+    np.testing.assert_array_equal(final_x, expected_x)
+    np.testing.assert_allclose(final_y, expected_y)
+
+
+def test_random_input_matches_np_unique(graph):
+    rng = np.random.default_rng(1)
+    x = rng.integers(0, 50, size=500).astype(float)
+    y = rng.normal(size=500)
+    expected_x, expected_y = unique_aggregate(x, y)
+    for with_diffs in (False, True):
+        final_x, final_y = sorted_aggregate(graph, x, y, with_diffs)
+        np.testing.assert_array_equal(final_x, expected_x)
+        np.testing.assert_allclose(final_y, expected_y)
+
+
+def test_smooth_curve_sorted_and_unsorted_agree(graph):
+    pytest.importorskip("scipy")
+    rng = np.random.default_rng(2)
+    x = np.repeat(np.arange(20.0), 2)
+    y = rng.normal(size=40)
+    order = rng.permutation(40)
+    sorted_curve = graph.compute_smooth_curve(x, y)
+    shuffled_curve = graph.compute_smooth_curve(x[order], y[order])
+    np.testing.assert_allclose(sorted_curve[0], shuffled_curve[0])
+    np.testing.assert_allclose(sorted_curve[1], shuffled_curve[1])
+    assert len(sorted_curve[0]) == 300
+
+
+def test_smooth_curve_fast_path_matches_interp(graph):
+    x = np.arange(graph.FAST_SMOOTH_MIN_POINTS + 10, dtype=float)
+    y = np.sin(x / 50)
+    x_smooth, y_smooth = graph.compute_smooth_curve(x, y, high_quality=False)
+    np.testing.assert_allclose(y_smooth, np.interp(x_smooth, x, y))
+
+
+def test_smooth_curve_needs_two_distinct_x(graph):
+    with pytest.raises(ValueError):
+        graph.compute_smooth_curve(np.full(5, 1.0), np.arange(5.0))
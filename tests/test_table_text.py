@@ -0,0 +1,58 @@
+""" 表格顯示與複製的文字測試：整數欄位雖以 float 保存，仍顯示為 "1" 而非 "1.0"。 """
+import pytest
+
+np = pytest.importorskip("numpy")
+pd = pytest.importorskip("pandas")
+
+
+def load_frame(graph, window, df):
+    """ 模擬載入檔案並選擇第一欄為 X、第二欄為 Y。 """
+    window.on_file_loaded(graph.column_arrays(df))
+    window.update_data_from_file_input()
+    return window.table_model
+
+
+def table_texts(model):
+    return [[model.data(model.index(r, c)) for c in (0, 1)] for r in range(model.rowCount())]
+
+
+def copy_all(window):
+    from PySide6.QtWidgets import QApplication
+    window.data_table.selectAll()
+    window.copy_data()
+    return QApplication.clipboard().text()
+
+
+def test_integer_column_text(graph, window):
+    model = load_frame(graph, window, pd.DataFrame({'x': [1, 2, 3], 'y': [10, -20, 30]}))
+    assert table_texts(model) == [['1', '10'], ['2', '-20'], ['3', '30']]
+    assert model.column_text(1, 0, 3).tolist() == ['10', '-20', '30']
+    assert copy_all(window).split('\n') == ['1\t10\t', '2\t-20\t', '3\t30\t']
+
+
+def test_float_column_keeps_decimal_point(graph, window):
+    model = load_frame(graph, window, pd.DataFrame({'x': [1.0, 2.5], 'y': [3.0, 4.0]}))
+    assert table_texts(model) == [['1.0', '3.0'], ['2.5', '4.0']]
+    assert model.column_text(0, 0, 2).tolist() == ['1.0', '2.5']
+
+
+def test_nullable_integer_column(graph, window):
+    model = load_frame(graph, window, pd.DataFrame({'x': [1, 2], 'y': pd.array([5, None], dtype='Int64')}))
+    assert table_texts(model) == [['1', '5'], ['2', 'nan']]
+
+
+def test_edited_integer_column(graph, window):
+    model = load_frame(graph, window, pd.DataFrame({'x': [1, 2, 3], 'y': [10, 20, 30]}))
+    window.set_cell_texts([(0, 1, '2.5')])
+    assert model.column_text(1, 0, 3).tolist() == ['2.5', '20', '30']
+    # 輸入文字後欄位不再是數值欄位，其餘的整數值仍顯示為整數
+    window.set_cell_texts([(1, 1, 'abc')])
+    assert table_texts(model) == [['1', '2.5'], ['2', 'abc'], ['3', '30']]
+
+
+def test_cell_text_matches_column_texts(graph):
+    values = np.array([0.0, -0.0, 1.0, -7.0, 2.5, np.nan, np.inf, 1e20, 3e18])
+    expected = graph.column_texts(values, True).tolist()
+    assert [graph.cell_text(v, True) for v in values] == expected
+    assert expected[:5] == ['0', '0', '1', '-7', '2.5']
+    assert graph.column_texts(values, False).tolist() == [str(v) for v in values]
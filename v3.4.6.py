@@ -3,76 +3,538 @@ import pandas as pd
 import matplotlib.pyplot as plt
 import matplotlib.font_manager as fm
 import matplotlib.ticker as ticker
+import matplotlib.colors as mcolors
 from matplotlib.collections import LineCollection
+from matplotlib.transforms import Bbox
 from matplotlib.backends.backend_qtagg import FigureCanvasQTAgg as FigureCanvas, NavigationToolbar2QT
 from PySide6.QtWidgets import (
     QApplication, QMainWindow, QWidget, QVBoxLayout, QHBoxLayout,
     QGridLayout, QLabel, QLineEdit, QPushButton,
     QComboBox, QFileDialog, QDoubleSpinBox, QMessageBox,
-    QColorDialog, QCheckBox, QTabWidget, QTableWidget, QTableWidgetItem,
+    QColorDialog, QCheckBox, QTabWidget, QTableView,
     QSpinBox, QScrollArea, QSizePolicy, QFrame, QListWidget, QAbstractItemView,
 )
-from PySide6.QtCore import Qt, QTimer
-from PySide6.QtGui import QColor, QKeySequence
+from PySide6.QtCore import Qt, QTimer, QObject, QRunnable, QThreadPool, Signal, QAbstractTableModel, QModelIndex
+from PySide6.QtGui import QBrush, QColor, QKeySequence
 import os
 from zipfile import BadZipFile
 import json
 import numpy as np
-import multiprocessing
-
-# 檢查 scipy 是否存在，並處理 ImportError
-try:
-    from scipy.interpolate import PchipInterpolator
-    SCIPY_AVAILABLE = True
-except ImportError:
-    SCIPY_AVAILABLE = False
+from contextlib import contextmanager
+from dataclasses import dataclass
+from functools import lru_cache
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+import hashlib
+import importlib.util
+
+# 檢查 scipy 是否存在；匯入 scipy 需數百毫秒，實際匯入延後到第一次以 PCHIP 計算平滑曲線時
+SCIPY_AVAILABLE = importlib.util.find_spec('scipy') is not None
+if not SCIPY_AVAILABLE:
     print("警告: 找不到 scipy 函式庫，平滑曲線功能將不可用。請使用 'pip install scipy' 進行安裝。")
 
+# 已安裝 python-calamine 且 pandas 為 2.2 以上時，以 calamine (Rust 實作) 讀取 Excel，
+# 速度與記憶體用量皆遠優於預設的 openpyxl；否則沿用 pandas 的預設引擎
+if importlib.util.find_spec('python_calamine') is not None and tuple(int(v) for v in pd.__version__.split('.')[:2]) >= (2, 2):
+    EXCEL_ENGINE = 'calamine'
+else:
+    EXCEL_ENGINE = None
+
 
 # ==============================================================================
-# 多核心處理的工作函式 (START)
-# 必須將此函式定義在最上層，以便子處理程序可以找到它
+# 平滑曲線的工作函式 (START)
+# 定義在最上層，由常駐的 smooth_executor 執行緒池呼叫
 # ==============================================================================
-def calculate_smooth_curve_worker(args):
+def aggregate_duplicate_x(sorted_x, sorted_y, diffs=None):
     """
-    為單一數據集計算平滑曲線。
-    這個函式將被每個獨立的 CPU 核心執行。
+    合併已排序數據中重複的 x 值，對應的 y 值取平均。
+    重複值在排序後必為連續區段：以相鄰差值找出各區段起點 (線性時間，不再以 np.unique 重新排序)，
+    再以 np.add.reduceat 一次完成分組加總。呼叫端已算好 np.diff(sorted_x) 時可傳入 diffs 重複使用。
+    NaN 排序後位於最後，與 np.unique 相同視為同一個值合併。
     """
-    x_data, y_data, dataset_index = args
-    try:
-        # 數據必須先排序才能進行插值
-        sorted_indices = np.argsort(x_data)
-        sorted_x = np.array(x_data)[sorted_indices]
-        sorted_y = np.array(y_data)[sorted_indices]
-
-        # PchipInterpolator 需要唯一的 x 值，如果存在重複的 x，則取其 y 值的平均
-        unique_x, unique_indices, counts = np.unique(sorted_x, return_index=True, return_counts=True)
-        if len(unique_x) < 2:
-            # 如果唯一數據點少於2個，無法插值，返回原始數據
-            return (dataset_index, sorted_x, sorted_y, None)
-
-        if len(unique_x) < len(sorted_x):
-            # 處理重複的 x 值
-            final_y = [np.mean(sorted_y[sorted_x == x_val]) for x_val in unique_x]
-            final_x, final_y = unique_x, np.array(final_y)
-        else:
-            final_x, final_y = sorted_x, sorted_y
+    changed = sorted_x[1:] != sorted_x[:-1] if diffs is None else diffs != 0
+    if len(sorted_x) > 1 and np.isnan(sorted_x[-1]):
+        changed &= ~(np.isnan(sorted_x[1:]) & np.isnan(sorted_x[:-1]))
+    starts = np.flatnonzero(np.concatenate(([True], changed)))
+    if len(starts) == len(sorted_x):
+        return sorted_x, sorted_y
+    counts = np.diff(np.append(starts, len(sorted_x)))
+    return sorted_x[starts], np.add.reduceat(sorted_y, starts) / counts
 
-        # 建立插值器並計算平滑曲線的點
-        interpolator = PchipInterpolator(final_x, final_y)
-        x_smooth = np.linspace(min(final_x), max(final_x), 300)
-        y_smooth = interpolator(x_smooth)
 
-        # 返回計算結果和原始索引
-        return (dataset_index, x_smooth, y_smooth, None)
-    except Exception as e:
-        # 如果發生錯誤，返回錯誤訊息
-        return (dataset_index, None, None, str(e))
+def compute_smooth_curve(x_data, y_data, high_quality=True):
+    """
+    以 PCHIP 插值計算平滑曲線，回傳 (x_smooth, y_smooth)。
+    high_quality 為 False 且數據點超過 FAST_SMOOTH_MIN_POINTS 時改用線性插值 (np.interp)，
+    在 300 個輸出點下與 PCHIP 幾乎無法分辨。唯一 x 值少於兩個時引發 ValueError。
+    """
+    # x 已遞增 (最常見的情況) 時不需排序與重新排列，相鄰差值並直接用於找出重複的 x
+    diffs = np.diff(x_data)
+    if not np.all(diffs >= 0):
+        sorted_indices = np.argsort(x_data, kind='stable')
+        x_data, y_data = x_data[sorted_indices], y_data[sorted_indices]
+        diffs = None
+    final_x, final_y = aggregate_duplicate_x(x_data, y_data, diffs)
+    if len(final_x) < 2: raise ValueError("需要至少兩個不同的數據點來生成平滑曲線。")
+
+    # final_x 已排序，首尾即為最小與最大值
+    x_smooth = np.linspace(final_x[0], final_x[-1], 300)
+    if not high_quality and len(final_x) > FAST_SMOOTH_MIN_POINTS:
+        return x_smooth, np.interp(x_smooth, final_x, final_y)
+    from scipy.interpolate import PchipInterpolator
+    return x_smooth, PchipInterpolator(final_x, final_y)(x_smooth)
 # ==============================================================================
-# 多核心處理的工作函式 (END)
+# 平滑曲線的工作函式 (END)
 # ==============================================================================
 
 
+# 介面選項文字與 Matplotlib 參數的對照表
+LINESTYLE_MAP = {"實線": "-", "虛線": "--", "點虛線": "-.", "點": ":"}
+MARKER_MAP = {"圓形": "o", "方形": "s", "三角形": "^", "星形": "*", "無": "None"}
+TICK_DIRECTION_MAP = {"朝外": "out", "朝內": "in", "朝內外": "inout"}
+# 上述下拉選單的 {選項文字: 索引}，選單項目即依對照表的順序加入
+LINESTYLE_INDEX = {text: i for i, text in enumerate(LINESTYLE_MAP)}
+MARKER_INDEX = {text: i for i, text in enumerate(MARKER_MAP)}
+TICK_DIRECTION_INDEX = {text: i for i, text in enumerate(TICK_DIRECTION_MAP)}
+
+# pd.api.types.infer_dtype 回傳值中可視為數值欄位的型態
+NUMERIC_INFERRED_TYPES = {'empty', 'integer', 'floating', 'mixed-integer-float', 'boolean'}
+# 其中可視為整數欄位的型態
+INTEGRAL_INFERRED_TYPES = {'integer', 'boolean'}
+
+# 數據點顏色陣列的 dtype ("#rrggbb" 或 "#rrggbbaa")
+COLOR_DTYPE = '<U9'
+# 平滑曲線快取保留的最大筆數
+SMOOTH_CACHE_SIZE = 64
+# 未勾選高品質平滑時，超過此點數的數據集改用線性插值
+FAST_SMOOTH_MIN_POINTS = 2000
+# 待計算的平滑曲線總點數達到此值時才交給執行緒池平行計算，較少時直接在主執行緒計算
+PARALLEL_SMOOTH_MIN_POINTS = 2000
+# 啟用數據標籤上限時，可視範圍內最多建立的數據標籤數
+MAX_DATA_LABELS = 500
+# 折線超過此點數且 x 遞增時，依畫面寬度以區段最小/最大值抽樣後再繪製
+DECIMATE_MIN_POINTS = 5000
+# 數據檔欄位數達到此值時，以多執行緒同時轉換各欄並判斷型態
+PARALLEL_COLUMNS_MIN = 8
+
+# 依序嘗試的中文字體，以及掃描系統字體檔時比對的檔名關鍵字
+CHINESE_FONT_NAMES = ['Microsoft YaHei', 'SimHei', 'PingFang SC', 'Heiti TC', 'Arial Unicode MS']
+CHINESE_FONT_KEYWORDS = ['simhei', 'yahei', 'pingfang', 'heiti']
+# 記錄上次找到的中文字體，下次啟動時略過耗時的系統字體掃描
+FONT_CACHE_PATH = os.path.join(os.path.expanduser('~'), '.cache', 'plotting_app', 'font.json')
+
+
+def as_column_array(values):
+    """
+    將一欄數據轉為 NumPy 陣列，回傳 (陣列, 是否全為數值, 是否為整數欄位)；非數值欄位以 object 陣列保存。
+    數值欄位一律轉為 float，原本為整數的欄位以旗標記錄，表格中的整數值仍顯示為 "1" 而非 "1.0"。
+    """
+    arr = np.asarray(values)
+    if arr.dtype.kind in 'biuf':
+        return arr.astype(float, copy=False), True, arr.dtype.kind != 'f'
+    arr = np.asarray(values, dtype=object)
+    # infer_dtype 以 C 迴圈判斷 object 陣列的內容型態，取代逐項 isinstance 掃描
+    if (inferred := pd.api.types.infer_dtype(arr, skipna=False)) in NUMERIC_INFERRED_TYPES:
+        return arr.astype(float), True, inferred in INTEGRAL_INFERRED_TYPES
+    return arr, False, False
+
+
+def dataset_columns(x, y, colors):
+    """ 建立數據集的欄位陣列 (x, y, colors) 及其數值型態與整數欄位旗標。 """
+    x_arr, numeric_x, integral_x = as_column_array(x)
+    y_arr, numeric_y, integral_y = as_column_array(y)
+    return {'x': x_arr, 'y': y_arr, 'colors': np.asarray(colors, dtype=COLOR_DTYPE),
+            'numeric_x': numeric_x, 'numeric_y': numeric_y, 'integral_x': integral_x, 'integral_y': integral_y}
+
+
+def whole_values(values):
+    """ 回傳 float 陣列中可無損轉為 int64 的整數值遮罩 (NaN 與無限大除外)。 """
+    return np.isfinite(values) & (np.abs(values) < 2 ** 63) & (values == np.trunc(values))
+
+
+def column_texts(values, integral):
+    """ 一次將一欄數據轉為顯示文字；整數欄位中的整數值不加 ".0"，與載入檔案時的內容相同。 """
+    text = np.asarray(values, dtype=str)
+    if integral and (whole := whole_values(values)).any():
+        text[whole] = values[whole].astype(np.int64).astype(str)
+    return text
+
+
+def cell_text(value, integral):
+    """ 單一儲存格的顯示文字，結果與 column_texts 相同。 """
+    if integral and value.is_integer() and abs(value) < 2 ** 63:
+        return str(int(value))
+    return str(value)
+
+
+def segment_colors(color, n_points):
+    """ 產生 n_points 個點之間所有線段的單一顏色陣列。 """
+    return np.full(max(n_points - 1, 0), color, dtype=COLOR_DTYPE)
+
+
+def format_values(values, decimals, is_numeric):
+    """ 一次格式化整欄數據標籤；數值欄位以固定小數位數輸出，其餘欄位逐項轉字串。 """
+    if is_numeric:
+        return np.char.mod(f"%.{decimals}f", values)
+    return np.array([f"{v:.{decimals}f}" if isinstance(v, (int, float)) else f"{v}" for v in values], dtype=object)
+
+
+def join_columns(columns, sep):
+    """ 以 sep 逐列串接多欄文字 (np.char 向量化)；沒有任何欄位時回傳空陣列。 """
+    if not columns:
+        return np.array([], dtype=str)
+    joined = np.asarray(columns[0], dtype=str)
+    for column in columns[1:]:
+        joined = np.char.add(np.char.add(joined, sep), np.asarray(column, dtype=str))
+    return joined
+
+
+def join_labels(columns):
+    """ 以 ", " 逐點串接多欄已格式化的標籤文字。 """
+    return join_columns(columns, ", ")
+
+
+@lru_cache(maxsize=4096)
+def qcolor(hex_str):
+    """ 依十六進位色碼取得 QColor；同一顏色在表格中大量重複，因此快取重用。 """
+    return QColor(hex_str)
+
+
+@lru_cache(maxsize=4096)
+def qbrush(hex_str):
+    """ 表格背景用的 QBrush 快取，避免 setBackground 每次由 QColor 隱式建立新的筆刷。 """
+    return QBrush(qcolor(hex_str))
+
+
+def rgba_colors(colors):
+    """ 將色碼陣列轉為 (N, 4) 的 RGBA 陣列；只解析不重複的顏色，再以索引展開。 """
+    unique, inverse = np.unique(np.asarray(colors), return_inverse=True)
+    return mcolors.to_rgba_array(unique)[inverse.ravel()]
+
+
+def snapshot_datasets(datasets):
+    """
+    複製數據集清單作為快照；陣列欄位以 ndarray.copy() 複製，避免之後的就地修改影響快照。
+    唯讀的陣列 (載入檔案的欄位陣列或其視圖) 直接共用：就地修改前都會先以 writable_column 複製這類陣列。
+    """
+    return [{k: v.copy() if isinstance(v, np.ndarray) and v.flags.writeable else v for k, v in ds.items()} for ds in datasets]
+
+
+def to_numeric_column(values):
+    """
+    將字串陣列一次轉換為數值。全部可轉換時直接回傳 float64 陣列 (不經過逐項的 Python float 物件)，
+    否則回傳清單，無法轉換的項目保留原字串。
+    常見的整欄皆為數值的情況先以 astype 一次轉換，失敗時才逐項判斷哪些項目無法轉換。
+    """
+    values = np.asarray(values, dtype=object)
+    try:
+        numeric = values.astype(np.float64)
+    except (TypeError, ValueError):
+        pass
+    else:
+        # "nan" 等文字雖可轉換，仍交由下方的逐項判斷保留原字串；
+        # float() 另外接受 "1_000" 與全形數字，pd.to_numeric 則不接受，這類文字同樣交由下方判斷
+        text = ''.join(v for v in values.tolist() if isinstance(v, str))
+        if not np.isnan(numeric).any() and text.isascii() and '_' not in text:
+            return numeric
+    numeric = pd.to_numeric(pd.Series(values), errors='coerce').to_numpy(dtype=float, na_value=np.nan)
+    missing = np.isnan(numeric)
+    if not missing.any():
+        return numeric
+    return np.where(missing, values, numeric.astype(object)).tolist()
+
+
+def minmax_indices(x, y, x_min, x_max, n_buckets):
+    """
+    回傳 x 遞增的折線在 [x_min, x_max] 範圍內的抽樣點索引 (已排序)。
+    範圍內的點依索引平均分成 n_buckets 段，每段只保留 y 最小與最大的點，折線在螢幕上的外形與完整數據相同；
+    範圍外各多保留一點，讓線段延伸到邊界。
+    含缺值 (NaN) 的區段忽略 NaN 取最小與最大值，並另外保留該段第一個 NaN，使折線在缺值處仍然斷開。
+    """
+    lo = max(int(np.searchsorted(x, x_min, 'left')) - 1, 0)
+    hi = min(int(np.searchsorted(x, x_max, 'right')) + 1, len(x))
+    if hi - lo <= 4 * n_buckets:
+        return np.arange(lo, hi)
+    size = (hi - lo) // n_buckets
+    body = y[lo:lo + size * n_buckets].reshape(n_buckets, size)
+    offsets = lo + np.arange(n_buckets) * size
+    low = high = body
+    gaps = np.empty(0, dtype=np.intp)
+    if (nan := np.isnan(body)).any():
+        # argmin/argmax 遇到 NaN 會直接回傳 NaN 的位置，先以 ±inf 取代
+        low, high = np.where(nan, np.inf, body), np.where(nan, -np.inf, body)
+        has_gap = nan.any(axis=1)
+        gaps = offsets[has_gap] + nan.argmax(axis=1)[has_gap]
+    return np.unique(np.concatenate((
+        [lo, hi - 1], offsets + low.argmin(axis=1), offsets + high.argmax(axis=1), gaps, np.arange(lo + size * n_buckets, hi),
+    )))
+
+
+def nearest_point_index(x, y, px, py):
+    """ 回傳距離 (px, py) 最近的點索引；平方距離以就地運算累加，只配置兩個暫存陣列。 """
+    dist = np.subtract(x, px)
+    dist *= dist
+    dy = np.subtract(y, py)
+    dy *= dy
+    dist += dy
+    return int(np.argmin(dist))
+
+
+def line_segments(points, seg_colors, kept=None):
+    """
+    由點座標建立 LineCollection 的 (N-1, 2, 2) 線段陣列；傳入 kept 時只連接抽樣點，線段顏色取起點所在線段的顏色。
+    抽樣時以一次索引直接取出每條線段的兩端點，不先複製出抽樣點陣列。
+    """
+    if kept is not None:
+        return points[np.column_stack((kept[:-1], kept[1:]))], seg_colors[kept[:-1]]
+    segments = np.empty((max(len(points) - 1, 0), 2, 2), dtype=float)
+    segments[:, 0] = points[:-1]
+    segments[:, 1] = points[1:]
+    return segments, seg_colors
+
+
+def read_data_file(filename):
+    """
+    依副檔名讀取 Excel 或 CSV 檔案 (CSV 先以 UTF-8 讀取，失敗時改用 Big5)。
+    CSV 以 low_memory=False 一次推斷整欄型態，避免大型檔案分塊推斷後得到數值與文字混雜的 object 欄位；
+    並以 memory_map 直接從記憶體映射讀取檔案，省去大型檔案的緩衝讀取成本。
+    """
+    ext = os.path.splitext(filename)[1].lower()
+    if ext in ['.xlsx', '.xls']:
+        return pd.read_excel(filename, engine=EXCEL_ENGINE)
+    if ext == '.csv':
+        try: return pd.read_csv(filename, encoding='utf-8', low_memory=False, memory_map=True)
+        except UnicodeDecodeError: return pd.read_csv(filename, encoding='big5', low_memory=False, memory_map=True)
+    raise ValueError(f"不支援的檔案格式：{ext}")
+
+
+def column_array(col):
+    """
+    轉換單一欄位並判斷型態，回傳 (陣列, 是否全為數值, 是否為整數欄位)。
+    回傳的陣列會被多個數據集共用 (並作為重新選擇欄位時的來源)，因此設為唯讀；修改前須以 writable_column 取得副本。
+    """
+    if pd.api.types.is_numeric_dtype(col):
+        integral = pd.api.types.is_integer_dtype(col) or pd.api.types.is_bool_dtype(col)
+        arr, is_numeric = col.to_numpy(dtype=float, na_value=np.nan), True
+    else:
+        arr, is_numeric, integral = as_column_array(col.to_numpy(dtype=object))
+    arr.flags.writeable = False
+    return arr, is_numeric, integral
+
+
+def writable_column(ds, key):
+    """
+    回傳可就地修改的 ds[key]。唯讀的陣列 (載入檔案的欄位陣列或其視圖) 由其他數據集共用，
+    先複製一份給此數據集再修改；之後的修改都直接寫入這份副本。
+    """
+    if not (arr := ds[key]).flags.writeable:
+        arr = ds[key] = arr.copy()
+    return arr
+
+
+def column_arrays(df):
+    """
+    回傳 {欄名: (陣列, 是否全為數值, 是否為整數欄位)}，型態只在載入時判斷一次，之後切換欄位不必重新掃描。
+    數值欄位一次轉為 float 陣列 (float64 欄位為零複製，可為空的整數欄位以 NaN 表示缺值)，
+    其他欄位 (文字、日期) 轉為 object 以保留原本的 Python 物件。寬表格的各欄分散到多個執行緒轉換。
+    """
+    columns = [col for _, col in df.items()]
+    if len(columns) < PARALLEL_COLUMNS_MIN:
+        return dict(zip(df.columns, map(column_array, columns)))
+    with ThreadPoolExecutor(max_workers=min(8, len(columns))) as executor:
+        return dict(zip(df.columns, executor.map(column_array, columns)))
+
+
+class FileLoadSignals(QObject):
+    """ FileLoadWorker 回報結果用的訊號 (QRunnable 本身不是 QObject)。 """
+    finished = Signal(object)
+    failed = Signal(str)
+
+
+class FileLoadWorker(QRunnable):
+    """ 在背景執行緒讀取數據檔並轉換欄位陣列，避免大型檔案凍結介面。 """
+    def __init__(self, filename):
+        super().__init__()
+        self.filename = filename
+        self.signals = FileLoadSignals()
+
+    def run(self):
+        try:
+            # 只回傳轉換後的欄位陣列；DataFrame 隨即釋放，不與轉換結果同時常駐記憶體
+            self.signals.finished.emit(column_arrays(read_data_file(self.filename)))
+        except Exception as e:
+            self.signals.failed.emit(str(e))
+
+
+# DatasetTableModel.data 有提供內容的角色
+TABLE_DATA_ROLES = frozenset((Qt.ItemDataRole.DisplayRole, Qt.ItemDataRole.EditRole, Qt.ItemDataRole.BackgroundRole))
+
+
+class DatasetTableModel(QAbstractTableModel):
+    """
+    直接以 PlottingApp.datasets 作為資料來源的表格模型：第 0 欄為 X，之後每個數據集各佔 Y 與顏色兩欄。
+    儲存格文字只在檢視繪製可見範圍時才產生，不為每一格建立 QTableWidgetItem。
+    """
+    def __init__(self, app):
+        super().__init__(app)
+        self.app = app
+        # 檢視最後一次得知的 (列數, 欄數)；None 表示尚未載入過
+        self.shape = None
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else max((len(ds['x']) for ds in self.app.datasets), default=0)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else 1 + max(len(self.app.datasets), 1) * 2
+
+    def cell(self, row, col):
+        """ 回傳儲存格對應的 (數據集, 欄位鍵 'x'/'y'/'colors')；該數據集沒有這一列時回傳 (None, None)。 """
+        datasets = self.app.datasets
+        ds_index = (col - 1) // 2 if col else 0
+        if ds_index < len(datasets) and row < len((ds := datasets[ds_index])['x']):
+            return ds, ('x', 'y', 'colors')[0 if col == 0 else 2 - col % 2]
+        return None, None
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        # 檢視繪製每個儲存格時會查詢十餘種角色，其他角色不需先找出對應的數據集
+        if role not in TABLE_DATA_ROLES:
+            return None
+        ds, key = self.cell(index.row(), index.column())
+        if ds is None:
+            return None
+        if key == 'colors':
+            return qbrush(ds['colors'][index.row()]) if role == Qt.ItemDataRole.BackgroundRole else None
+        if role != Qt.ItemDataRole.BackgroundRole:
+            return cell_text(ds[key][index.row()], ds[f'integral_{key}'])
+        return None
+
+    def setData(self, index, value, role=Qt.ItemDataRole.EditRole):
+        if role != Qt.ItemDataRole.EditRole or not index.isValid():
+            return False
+        self.app.set_cell_texts([(index.row(), index.column(), str(value).strip())])
+        self.dataChanged.emit(index, index)
+        self.app.update_data_from_table()
+        return True
+
+    def flags(self, index):
+        flags = super().flags(index)
+        ds, key = self.cell(index.row(), index.column())
+        # 顏色欄以點擊開啟顏色選擇器修改，不可直接編輯
+        if ds is not None and key != 'colors':
+            flags |= Qt.ItemFlag.ItemIsEditable
+        return flags
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if orientation == Qt.Orientation.Vertical or role != Qt.ItemDataRole.DisplayRole:
+            return super().headerData(section, orientation, role)
+        if section == 0:
+            return "X 數據"
+        if section % 2 == 0:
+            return "顏色"
+        datasets = self.app.datasets
+        return f"Y: {datasets[(section - 1) // 2]['name']}" if datasets else "Y 數據"
+
+    def column_text(self, col, start, stop):
+        """
+        回傳第 col 欄第 start 至 stop - 1 列的顯示文字陣列 (與 data() 的 DisplayRole 相同)，
+        整段一次轉為字串；顏色欄與數據集沒有的列為空字串。
+        """
+        datasets = self.app.datasets
+        ds_index = (col - 1) // 2 if col else 0
+        if (col and col % 2 == 0) or ds_index >= len(datasets):
+            return np.full(stop - start, '', dtype=str)
+        ds, key = datasets[ds_index], 'x' if col == 0 else 'y'
+        text = column_texts(ds[key][start:stop], ds[f'integral_{key}'])
+        if len(text) < stop - start:
+            text = np.concatenate((text, np.full(stop - start - len(text), '', dtype=text.dtype)))
+        return text
+
+    def search_texts(self):
+        """
+        回傳各列所有欄位的顯示文字以 tab 串接並轉為小寫的字串陣列，
+        逐欄以 np.char 向量化建立，不逐格呼叫 data()。
+        """
+        if not self.app.datasets:
+            return np.array([], dtype=str)
+        return np.char.lower(join_columns([self.column_text(c, 0, self.rowCount()) for c in range(self.columnCount())], '\t'))
+
+    def refresh(self):
+        """
+        數據集的列數、欄數或整體內容改變後通知檢視重新讀取，回傳是否重設了模型。
+        列數與欄數未變時 (排序、移動列、貼上) 只通知所有儲存格與欄標題已變動，
+        保留檢視的選取、捲動位置與隱藏列，不必重設整個模型。
+        """
+        shape = (self.rowCount(), self.columnCount())
+        if shape == self.shape:
+            rows, cols = shape
+            if rows:
+                self.dataChanged.emit(self.index(0, 0), self.index(rows - 1, cols - 1))
+            self.headerDataChanged.emit(Qt.Orientation.Horizontal, 0, cols - 1)
+            return False
+        self.beginResetModel()
+        self.shape = shape
+        self.endResetModel()
+        return True
+
+
+def font_available(font_name):
+    """ 檢查 Matplotlib 是否能找到指定字體 (不退回預設字體)。 """
+    try:
+        return bool(fm.fontManager.findfont(font_name, fallback_to_default=False))
+    except ValueError:
+        return False
+
+
+def find_chinese_font():
+    """
+    尋找可用的中文字體，回傳 (字體名稱, 字體檔路徑)；已安裝於 Matplotlib 的字體路徑為 None。
+    找不到時回傳 None。掃描系統字體 (findSystemFonts) 可能需要數秒。
+    """
+    for font_name in CHINESE_FONT_NAMES:
+        if font_available(font_name):
+            return font_name, None
+    for font_path in fm.findSystemFonts(fontpaths=None, fontext='ttf'):
+        if any(kw in os.path.basename(font_path).lower() for kw in CHINESE_FONT_KEYWORDS):
+            fm.fontManager.addfont(font_path)
+            return os.path.basename(font_path).replace('.ttf', ''), font_path
+    return None
+
+
+def load_cached_font():
+    """ 讀取字體快取並確認字體仍然可用，回傳字體名稱；快取無效時回傳 None。 """
+    try:
+        with open(FONT_CACHE_PATH, 'r', encoding='utf-8') as f:
+            cached = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if not isinstance(cached, dict) or not (font_name := cached.get('font')):
+        return None
+    if font_path := cached.get('path'):
+        if not os.path.isfile(font_path):
+            return None
+        fm.fontManager.addfont(font_path)
+        return font_name
+    return font_name if font_available(font_name) else None
+
+
+def save_cached_font(font_name, font_path):
+    try:
+        os.makedirs(os.path.dirname(FONT_CACHE_PATH), exist_ok=True)
+        with open(FONT_CACHE_PATH, 'w', encoding='utf-8') as f:
+            json.dump({'font': font_name, 'path': font_path}, f, ensure_ascii=False)
+    except OSError as e:
+        print(f"警告: 無法寫入字體快取: {e}")
+
+
+@dataclass(frozen=True)
+class PlotLabel:
+    """ 描述一次繪圖所需的全部輸入，用於判斷 update_plot 是否需要重繪。 """
+    data: tuple
+    style: tuple
+    axis: tuple
+    text: tuple
+
+
 # 輔助類別，用於使 Matplotlib 的 artist (如文字) 可拖曳
 class DraggableArtist:
     """ 一個讓 Matplotlib artist (例如 Title, Label) 可被滑鼠拖曳的類別。 """
@@ -81,6 +543,8 @@ class DraggableArtist:
         self.canvas = canvas
         self.is_dragging = False
         self.press_offset = (0, 0)
+        self.background = None
+        self.inverse_transform = None
         
         self.cid_press = self.canvas.mpl_connect('button_press_event', self.on_press)
         self.cid_motion = self.canvas.mpl_connect('motion_notify_event', self.on_motion)
@@ -101,6 +565,13 @@ class DraggableArtist:
         pos_pixels = self.artist.get_transform().transform(pos_data)
 
         self.press_offset = (pos_pixels[0] - event.x, pos_pixels[1] - event.y)
+        # 拖曳期間座標轉換不變，按下時凍結一次反向轉換，移動時不必每次重新組合轉換鏈
+        self.inverse_transform = self.artist.get_transform().inverted().frozen()
+
+        # 拖曳期間以 blit 重繪：先在不含此 artist 的情況下完整繪製一次並快取背景
+        self.artist.set_animated(True)
+        self.canvas.draw()
+        self.background = self.canvas.copy_from_bbox(self.canvas.figure.bbox)
 
     def on_motion(self, event):
         """ 處理滑鼠移動事件 (使用像素座標) """
@@ -110,14 +581,23 @@ class DraggableArtist:
         x_pixel_new = event.x + self.press_offset[0]
         y_pixel_new = event.y + self.press_offset[1]
         
-        new_pos_native = self.artist.get_transform().inverted().transform((x_pixel_new, y_pixel_new))
+        new_pos_native = self.inverse_transform.transform((x_pixel_new, y_pixel_new))
 
         self.artist.set_position(new_pos_native)
-        self.canvas.draw_idle()
+        # 還原背景後只重畫被拖曳的 artist，不重新繪製整張圖
+        self.canvas.restore_region(self.background)
+        self.canvas.figure.draw_artist(self.artist)
+        self.canvas.blit(self.canvas.figure.bbox)
 
     def on_release(self, event):
         """ 處理滑鼠釋放事件 """
+        if not self.is_dragging:
+            return
         self.is_dragging = False
+        self.background = None
+        self.inverse_transform = None
+        self.artist.set_animated(False)
+        self.canvas.draw_idle()
         
     def disconnect(self):
         """ 斷開所有事件連接，用於清理 """
@@ -126,6 +606,13 @@ class DraggableArtist:
         self.canvas.mpl_disconnect(self.cid_release)
 
 
+class PlotToolbar(NavigationToolbar2QT):
+    """ 匯出圖片前先完成排程中的重繪，確保存檔內容為最新狀態。 """
+    def save_figure(self, *args):
+        self.window().flush_plot()
+        return super().save_figure(*args)
+
+
 class PlottingApp(QMainWindow):
     """
     主要應用程式視窗類別，包含 GUI 和所有繪圖邏輯。
@@ -140,30 +627,97 @@ class PlottingApp(QMainWindow):
         
         self.figure, self.ax = plt.subplots()
         self.canvas = FigureCanvas(self.figure)
-        self.toolbar = NavigationToolbar2QT(self.canvas, self)
+        self.toolbar = PlotToolbar(self.canvas, self)
         self.toolbar.setSizePolicy(QSizePolicy.Policy.Maximum, QSizePolicy.Policy.Fixed)
         self.legend = None
+        # 目前圖例的 (handles, labels)，只改圖例字體大小時用來單獨重建圖例
+        self.legend_entries = ([], [])
 
-        self.excel_data = None
+        # 載入檔案的 {欄名: (陣列, 是否全為數值)}；沒有載入檔案時為空
+        self._col_arrays = {}
+        # 背景讀檔中的工作物件；同時保留參照以免訊號物件被回收
+        self.load_worker = None
         self.data_source = 'manual'
-        self.is_updating_table = False
+        # 表格批次修改的巢狀深度；大於 0 時表格訊號已暫停，相關槽函式應直接返回
+        self.table_update_depth = 0
         self.is_updating_ui = False
         self.original_datasets = []
+        self.original_datasets_dirty = False
+        # 每列小寫文字的搜尋索引，表格內容變動時設為 None，於下次篩選時重建
+        self.row_search_blobs = None
+        # 目前被篩選隱藏的列 (布林陣列)；表格重新載入後所有列皆顯示，設為 None
+        self.hidden_rows = None
+        # 範本設定的元件存取對照表，首次存取範本時建立
+        self.settings_widgets = None
+        self.settings_signal_widgets = []
+        self.hex_setting_names = []
+        # 範本元件值的版本號，任一元件值變動時遞增；get_settings 以此判斷快取是否仍有效
+        self.settings_version = 0
+        self.settings_cache_version = -1
+        self.settings_cache = {}
         self.last_sort_info = {'col': -1, 'count': 0}
         
         self.selected_artist_info = None
         
         self.datasets = []
         self.artists_map = {}
+        # 以 (數據集索引, 種類) 快取折線與散佈圖 artist，重繪時直接更新數據與樣式而不重新建立
+        self.artist_cache = {}
+        # 數據內容版本號，任何直接修改 self.datasets 的操作都需遞增
+        self.data_version = 0
+        self.last_plot_label = None
+        self.last_layout_label = None
+        # 平滑曲線結果以 (x, y) 內容雜湊為鍵快取 (LRU)，只改樣式的重繪不必重新插值
+        self.smooth_cache = OrderedDict()
+        # 常駐的平滑曲線執行緒池，避免每次重繪重新建立工作者
+        self.smooth_executor = ThreadPoolExecutor(max_workers=os.cpu_count())
+
+        # 將短時間內連續觸發的重繪請求合併為一次 (例如拖曳 spinbox 時)
+        self.replot_timer = QTimer(self)
+        self.replot_timer.setSingleShot(True)
+        self.replot_timer.setInterval(30)
+        self.replot_timer.timeout.connect(self.do_update_plot)
+        # 只調整外觀的 blit 重繪每個畫面更新週期 (約 16 ms) 最多執行一次
+        self.restyle_timer = QTimer(self)
+        self.restyle_timer.setSingleShot(True)
+        self.restyle_timer.setInterval(16)
+        self.restyle_timer.timeout.connect(self.do_restyle_plot)
+        # 同理合併檔案欄位選擇的連續變更 (例如拖曳多選 Y 欄位)，避免每選一欄就重建數據集與表格
+        self.file_input_timer = QTimer(self)
+        self.file_input_timer.setSingleShot(True)
+        self.file_input_timer.setInterval(50)
+        self.file_input_timer.timeout.connect(self.update_data_from_file_input)
 
         self.annotations = []
+        # 數據標籤只為可視範圍內的點建立：label_specs 保存每個數據集的標籤內容，
+        # data_label_artists 以 (數據集索引, 點索引) 對應目前已建立的標籤
+        self.label_specs = []
+        self.data_label_artists = {}
+        self.median_annotations = []
+        self.label_cull_timer = QTimer(self)
+        self.label_cull_timer.setSingleShot(True)
+        self.label_cull_timer.setInterval(50)
+        self.label_cull_timer.timeout.connect(self.refresh_data_labels)
         self.dragged_annotation = None
         self.drag_start_offset = (0, 0)
+        self.drag_inverse_transform = None
+        # 拖曳數據標籤期間的背景：包含其他所有 animated artist，只缺被拖曳的標籤
+        self.drag_background = None
+        # 被拖曳標籤上一次繪製時的螢幕邊界框，移動時只需更新新舊位置涵蓋的區域
+        self.drag_extent = None
+        # 拖曳期間需畫在被拖曳標籤之上的疊加 artist (例如圖例)
+        self.drag_overlay = []
         self.annotation_positions = {}
+        # (標註清單, 各標註螢幕邊界框陣列)；任何重繪後作廢，於下一次點擊時才重新計算
+        self.annotation_boxes = None
         
         self.draggable_handlers = []
         
-        self.highlighted_widgets = []
+        # blit 用的背景快取 (不含數據 artist)，於每次完整重繪後更新
+        self.blit_background = None
+        
+        # {widget: 高亮前的原始樣式}
+        self.highlighted_widgets = {}
 
         self.line_color_hex = "#1f77b4"
         self.point_color_hex = "#ff7f0e"
@@ -180,10 +734,17 @@ class PlottingApp(QMainWindow):
         self.canvas.mpl_connect('button_press_event', self.on_press_annotate)
         self.canvas.mpl_connect('motion_notify_event', self.on_motion_annotate)
         self.canvas.mpl_connect('button_release_event', self.on_release_annotate)
+        self.canvas.mpl_connect('draw_event', self.on_draw_event)
         
         self.canvas.setFocusPolicy(Qt.FocusPolicy.ClickFocus)
         self.canvas.setFocus()
 
+        self.combo_indices = {
+            self.linestyle_combo: LINESTYLE_INDEX,
+            self.marker_combo: MARKER_INDEX,
+            self.tick_direction_combo: TICK_DIRECTION_INDEX,
+        }
+
         self.update_button_color()
         self.update_plot()
         self.update_table()
@@ -194,24 +755,14 @@ class PlottingApp(QMainWindow):
         嘗試設定中文字體，如果失敗則印出警告。
         """
         try:
-            font_names = ['Microsoft YaHei', 'SimHei', 'PingFang SC', 'Heiti TC', 'Arial Unicode MS']
-            found_font = None
-            for font_name in font_names:
-                if fm.fontManager.findfont(font_name, fallback_to_default=False):
-                    found_font = font_name
-                    break
-            
+            found_font = load_cached_font()
+            if found_font is None and (found := find_chinese_font()):
+                found_font, font_path = found
+                save_cached_font(found_font, font_path)
+
             if found_font:
                 plt.rcParams['font.sans-serif'] = found_font
                 print(f"找到並使用中文字體: {found_font}")
-            else:
-                font_paths = fm.findSystemFonts(fontpaths=None, fontext='ttf')
-                for font_path in font_paths:
-                    if any(kw in os.path.basename(font_path).lower() for kw in ['simhei', 'yahei', 'pingfang', 'heiti']):
-                        fm.fontManager.addfont(font_path)
-                        plt.rcParams['font.sans-serif'] = os.path.basename(font_path).replace('.ttf', '')
-                        print(f"找到並使用系統字體: {plt.rcParams['font.sans-serif'][0]}")
-                        break
 
         except Exception as e:
             print(f"警告: 設定中文字體失敗，可能會出現亂碼。錯誤訊息: {e}")
@@ -265,13 +816,14 @@ class PlottingApp(QMainWindow):
         
         excel_layout.addWidget(QLabel("X 欄位:"), 1, 0)
         self.x_col_combo = QComboBox()
-        self.x_col_combo.currentIndexChanged.connect(self.update_data_from_file_input)
+        self.x_col_combo.currentIndexChanged.connect(lambda _: self.file_input_timer.start())
         excel_layout.addWidget(self.x_col_combo, 1, 1)
         
         excel_layout.addWidget(QLabel("Y 欄位 (可多選):"), 2, 0, 1, 2)
         self.y_col_list = QListWidget()
         self.y_col_list.setSelectionMode(QAbstractItemView.ExtendedSelection)
-        self.y_col_list.itemSelectionChanged.connect(self.update_data_from_file_input)
+        # 模型層級的 selectionChanged 以範圍批次送出，Shift 多選只觸發一次；再經由去抖動計時器合併連續點選
+        self.y_col_list.selectionModel().selectionChanged.connect(lambda *_: self.file_input_timer.start())
         excel_layout.addWidget(self.y_col_list, 3, 0, 1, 2)
         excel_group = self.create_collapsible_container("檔案讀取", excel_layout)
         data_settings_layout.addWidget(excel_group)
@@ -279,18 +831,27 @@ class PlottingApp(QMainWindow):
         data_table_layout = QVBoxLayout()
         self.filter_input = QLineEdit()
         self.filter_input.setPlaceholderText("輸入文字以篩選表格...")
-        self.filter_input.textChanged.connect(self.filter_table)
+        # 連續輸入時等停頓後才篩選一次
+        self.filter_timer = QTimer(self)
+        self.filter_timer.setSingleShot(True)
+        self.filter_timer.setInterval(50)
+        self.filter_timer.timeout.connect(lambda: self.filter_table(self.filter_input.text()))
+        self.filter_input.textChanged.connect(lambda _: self.filter_timer.start())
         data_table_layout.addWidget(self.filter_input)
         
-        self.data_table = QTableWidget()
-        self.data_table.setColumnCount(3)
-        self.data_table.setHorizontalHeaderLabels(["X 數據", "Y 數據", "顏色"])
+        # 表格以 model/view 顯示 self.datasets，大型數據只為可見的儲存格產生內容
+        self.table_model = DatasetTableModel(self)
+        self.data_table = QTableView()
+        self.data_table.setModel(self.table_model)
         self.data_table.setColumnWidth(2, 60)
-        self.data_table.itemChanged.connect(self.update_data_from_table)
-        self.data_table.cellClicked.connect(self.pick_color_for_cell)
-        self.data_table.setSortingEnabled(True)
+        self.data_table.clicked.connect(lambda index: self.pick_color_for_cell(index.row(), index.column()))
         self.data_table.keyPressEvent = self.table_key_press_event
-        self.data_table.horizontalHeader().sortIndicatorChanged.connect(self.on_table_sort)
+        # 排序由 on_table_sort 自行處理 (先建立快照再排列數據集)，不使用檢視內建的排序
+        header = self.data_table.horizontalHeader()
+        header.setSectionsClickable(True)
+        header.setSortIndicatorShown(True)
+        header.setSortIndicator(-1, Qt.AscendingOrder)
+        header.sortIndicatorChanged.connect(self.on_table_sort)
         self.data_table.setSelectionBehavior(QAbstractItemView.SelectRows)
         data_table_layout.addWidget(self.data_table)
 
@@ -350,7 +911,7 @@ class PlottingApp(QMainWindow):
         self.legend_size_spinbox = QSpinBox()
         self.legend_size_spinbox.setMinimum(1)
         self.legend_size_spinbox.setValue(10)
-        self.legend_size_spinbox.valueChanged.connect(self.update_plot)
+        self.legend_size_spinbox.valueChanged.connect(self.restyle_legend)
         self.settings_layout.addWidget(self.legend_size_spinbox)
         
         self.settings_layout.addWidget(QLabel("顯示數據值:"))
@@ -366,13 +927,19 @@ class PlottingApp(QMainWindow):
         self.show_y_labels_checkbox.setChecked(True)
         self.show_y_labels_checkbox.toggled.connect(self.update_plot)
         data_label_layout.addWidget(self.show_y_labels_checkbox)
+        # 每個標籤都是獨立的 Text artist，勾選後點數很多時只均勻挑選一部分顯示，放大後會顯示更多。
+        # 預設不勾選，所有標籤照常顯示；勾選且實際省略標籤時，勾選框文字會標示目前的間隔
+        self.limit_labels_checkbox = QCheckBox(f"最多 {MAX_DATA_LABELS} 個")
+        self.limit_labels_checkbox.setToolTip(f"範圍內的標籤超過 {MAX_DATA_LABELS} 個時，只每隔幾個數據點顯示一個標籤")
+        self.limit_labels_checkbox.toggled.connect(self.refresh_data_labels)
+        data_label_layout.addWidget(self.limit_labels_checkbox)
         self.settings_layout.addLayout(data_label_layout)
         
         self.settings_layout.addWidget(QLabel("數據標籤大小:"))
         self.data_label_size_spinbox = QSpinBox()
         self.data_label_size_spinbox.setMinimum(1)
         self.data_label_size_spinbox.setValue(10)
-        self.data_label_size_spinbox.valueChanged.connect(self.update_plot)
+        self.data_label_size_spinbox.valueChanged.connect(self.restyle_plot)
         self.settings_layout.addWidget(self.data_label_size_spinbox)
         
         interval_layout = QHBoxLayout()
@@ -423,11 +990,18 @@ class PlottingApp(QMainWindow):
         self.connect_scatter_checkbox = QCheckBox("連接散佈點")
         self.connect_scatter_checkbox.toggled.connect(self.update_plot)
         self.smooth_line_checkbox = QCheckBox("平滑曲線")
-        self.smooth_line_checkbox.toggled.connect(self.update_plot)
+        # toggle_plot_settings 會同時更新「高品質平滑」的顯示並排程重繪
+        self.smooth_line_checkbox.toggled.connect(self.toggle_plot_settings)
+        self.hq_smooth_checkbox = QCheckBox("高品質平滑 (PCHIP)")
+        self.hq_smooth_checkbox.setChecked(True)
+        self.hq_smooth_checkbox.setToolTip(f"取消勾選時，超過 {FAST_SMOOTH_MIN_POINTS} 點的數據集改用較快的線性插值")
+        self.hq_smooth_checkbox.toggled.connect(self.update_plot)
         
         series_selection_layout = QHBoxLayout()
         series_selection_layout.addWidget(QLabel("選擇數據系列:"))
         self.series_combo = QComboBox()
+        # 目前選單中的數據系列名稱，比較時不必逐項讀回選單文字
+        self.series_combo_names = ()
         self.series_combo.currentIndexChanged.connect(self.on_series_selected_from_combo)
         series_selection_layout.addWidget(self.series_combo)
         self.style_layout.addLayout(series_selection_layout)
@@ -454,7 +1028,7 @@ class PlottingApp(QMainWindow):
         self.border_width_spinbox.setMinimum(0.0)
         self.border_width_spinbox.setValue(1.0)
         self.border_width_spinbox.setSingleStep(0.5)
-        self.border_width_spinbox.valueChanged.connect(self.update_plot)
+        self.border_width_spinbox.valueChanged.connect(self.restyle_plot)
         border_width_layout.addWidget(self.border_width_spinbox)
         self.style_layout.addLayout(border_width_layout)
 
@@ -559,7 +1133,7 @@ class PlottingApp(QMainWindow):
         self.tick_direction_layout = QHBoxLayout()
         self.tick_direction_layout.addWidget(QLabel("刻度線朝向:"))
         self.tick_direction_combo = QComboBox()
-        self.tick_direction_combo.addItems(["朝外", "朝內", "朝內外"])
+        self.tick_direction_combo.addItems(list(TICK_DIRECTION_MAP))
         self.tick_direction_combo.currentIndexChanged.connect(self.update_plot)
         self.tick_direction_layout.addWidget(self.tick_direction_combo)
         axis_style_layout.addLayout(self.tick_direction_layout)
@@ -649,8 +1223,12 @@ class PlottingApp(QMainWindow):
     def update_series_combo(self):
         """ 更新數據系列選擇下拉選單的內容 """
         self.series_combo.blockSignals(True)
-        self.series_combo.clear()
-        self.series_combo.addItems([ds['name'] for ds in self.datasets])
+        # 數據系列名稱未變動時 (例如新增/刪除列) 不重建選單項目
+        names = tuple(ds['name'] for ds in self.datasets)
+        if names != self.series_combo_names:
+            self.series_combo.clear()
+            self.series_combo.addItems(names)
+            self.series_combo_names = names
         
         if self.selected_artist_info:
             ds_index = self.selected_artist_info.get('dataset_index')
@@ -667,13 +1245,12 @@ class PlottingApp(QMainWindow):
     def select_dataset(self, ds_idx):
         """ 根據索引值，以程式化方式選取一個數據系列並更新UI """
         if 0 <= ds_idx < len(self.datasets):
-            try:
-                self.is_updating_ui = True
+            with self.batched_updates(self.dataset_style_widgets):
                 self.selected_artist_info = {'dataset_index': ds_idx, 'point_index': 0}
                 current_ds = self.datasets[ds_idx]
                 
-                if (idx := self.marker_combo.findText(current_ds.get('marker', '無'))) != -1: self.marker_combo.setCurrentIndex(idx)
-                if (idx := self.linestyle_combo.findText(current_ds.get('linestyle', '實線'))) != -1: self.linestyle_combo.setCurrentIndex(idx)
+                self.set_combo_text(self.marker_combo, current_ds.get('marker', '無'))
+                self.set_combo_text(self.linestyle_combo, current_ds.get('linestyle', '實線'))
                 self.line_width_spinbox.setValue(current_ds.get('linewidth', 2.0))
                 self.line_color_hex = current_ds.get('primary_color', '#1f77b4')
                 self.point_color_hex = current_ds.get('colors', [self.point_color_hex])[0]
@@ -684,9 +1261,6 @@ class PlottingApp(QMainWindow):
                 self.control_tabs.setCurrentWidget(self.plot_settings_tab)
                 self.highlight_widget(self.style_group)
                 self.plot_settings_scroll_area.ensureWidgetVisible(self.style_group)
-                
-            finally:
-                self.is_updating_ui = False
         
     def setup_dynamic_widgets(self):
         """ 為動態顯示的組件建立並添加布局。 """
@@ -711,23 +1285,26 @@ class PlottingApp(QMainWindow):
         self.style_layout.addWidget(self.point_size_label)
         self.point_size_spinbox.setMinimum(1.0)
         self.point_size_spinbox.setValue(10.0)
-        self.point_size_spinbox.valueChanged.connect(self.update_plot)
+        self.point_size_spinbox.valueChanged.connect(self.restyle_plot)
         self.style_layout.addWidget(self.point_size_spinbox)
         
         self.linestyle_label = QLabel("線條樣式:")
         self.style_layout.addWidget(self.linestyle_label)
-        self.linestyle_combo.addItems(["實線", "虛線", "點虛線", "點"])
+        self.linestyle_combo.addItems(list(LINESTYLE_MAP))
         self.linestyle_combo.currentIndexChanged.connect(self.update_artist_style)
         self.style_layout.addWidget(self.linestyle_combo)
         
         self.marker_label = QLabel("標記樣式:")
         self.style_layout.addWidget(self.marker_label)
-        self.marker_combo.addItems(["圓形", "方形", "三角形", "星形", "無"])
+        self.marker_combo.addItems(list(MARKER_MAP))
         self.marker_combo.currentIndexChanged.connect(self.update_artist_style)
         self.style_layout.addWidget(self.marker_combo)
+        # 選取數據系列時會以程式同步這些元件，期間直接暫停其訊號，不讓 update_artist_style 被呼叫後再返回
+        self.dataset_style_widgets = (self.marker_combo, self.linestyle_combo, self.line_width_spinbox)
         
         if SCIPY_AVAILABLE:
             self.style_layout.addWidget(self.smooth_line_checkbox)
+            self.style_layout.addWidget(self.hq_smooth_checkbox)
     
     def update_artist_style(self):
         """更新選定 artist 的樣式，或在未選定时更新所有 artist 的樣式。"""
@@ -740,29 +1317,200 @@ class PlottingApp(QMainWindow):
 
         if self.selected_artist_info:
             ds_index = self.selected_artist_info['dataset_index']
-            if 0 <= ds_index < len(self.datasets):
-                self.datasets[ds_index]['marker'] = new_marker
-                self.datasets[ds_index]['linewidth'] = new_linewidth
-                self.datasets[ds_index]['linestyle'] = new_linestyle
+            targets = [ds_index] if 0 <= ds_index < len(self.datasets) else []
         else:
-            for dataset in self.datasets:
-                dataset['marker'] = new_marker
-                dataset['linewidth'] = new_linewidth
-                dataset['linestyle'] = new_linestyle
+            targets = range(len(self.datasets))
 
-        self.update_plot()
+        # 只改線寬或線型時直接修改既有的線條 artist；標記樣式會改變散佈點的建立方式，仍需重建圖表
+        marker_changed = any(self.datasets[i].get('marker') != new_marker for i in targets)
+        for i in targets:
+            self.datasets[i].update(marker=new_marker, linewidth=new_linewidth, linestyle=new_linestyle)
+
+        if marker_changed or self.blit_background is None:
+            self.data_version += 1
+            self.update_plot()
+        else:
+            self.restyle_lines(set(targets), new_linewidth, LINESTYLE_MAP.get(new_linestyle, '-'))
+
+    def restyle_lines(self, ds_indices, linewidth, linestyle):
+        """ 就地套用數據集的線寬與線型 (平滑曲線固定為實線)，並重建圖例使其樣本一致。 """
+        for artist, info in self.artists_map.items():
+            if info['type'] != 'line' or info['dataset_index'] not in ds_indices:
+                continue
+            artist.set_linewidth(linewidth)
+            if not info.get('smooth'):
+                artist.set_linestyle(linestyle)
+            if (proxy := info.get('proxy_artist')) is not None:
+                proxy.set_linestyle(linestyle)
+        # 圖例保存的是建立當時的線條樣本副本，需重建才會反映新樣式
+        if self.legend is not None:
+            self.rebuild_legend()
+        self.canvas.draw_idle()
+
+    def build_plot_label(self):
+        """ 收集所有影響繪圖結果的輸入，組成可比較的 PlotLabel。 """
+        data = (self.data_version, self.data_source, bool(self.y_col_list.selectedItems()))
+        style = (
+            self.line_checkbox.isChecked(), self.scatter_checkbox.isChecked(),
+            self.bar_checkbox.isChecked(), self.box_checkbox.isChecked(),
+            self.connect_scatter_checkbox.isChecked(), self.smooth_line_checkbox.isChecked(),
+            self.hq_smooth_checkbox.isChecked(),
+            self.marker_combo.currentText(), self.linestyle_combo.currentText(),
+            self.line_width_spinbox.value(), self.point_size_spinbox.value(),
+            self.bar_width_spinbox.value(), self.border_width_spinbox.value(),
+            self.show_data_labels_checkbox.isChecked(), self.show_x_labels_checkbox.isChecked(),
+            self.show_y_labels_checkbox.isChecked(), self.x_decimal_spinbox.value(),
+            self.y_decimal_spinbox.value(), self.data_label_size_spinbox.value(),
+            self.legend_size_spinbox.value(),
+            self.line_color_hex, self.point_color_hex, self.bg_color_hex, self.border_color_hex,
+            self.x_label_color_hex, self.y_label_color_hex,
+            self.major_grid_checkbox.isChecked(), self.minor_grid_checkbox.isChecked(),
+            self.major_grid_color_hex, self.minor_grid_color_hex,
+        )
+        # axis 只收集會影響版面 (文字與刻度尺寸) 的設定，update_layout 以其判斷是否需要 tight_layout
+        axis = (
+            self.x_label_bold_checkbox.isChecked(), self.y_label_bold_checkbox.isChecked(),
+            self.x_label_size_spinbox.value(), self.y_label_size_spinbox.value(),
+            self.tick_direction_combo.currentText(),
+            self.major_tick_length_spinbox.value(), self.major_tick_width_spinbox.value(),
+            self.x_tick_label_size_spinbox.value(), self.y_tick_label_size_spinbox.value(),
+            self.x_tick_label_bold_checkbox.isChecked(), self.y_tick_label_bold_checkbox.isChecked(),
+            self.x_tick_rotation_spinbox.value(), self.y_tick_rotation_spinbox.value(),
+            self.x_interval_spinbox.value(), self.y_interval_spinbox.value(),
+            self.minor_x_interval_spinbox.value(), self.minor_y_interval_spinbox.value(),
+            self.axis_border_width_spinbox.value(),
+            self.minor_tick_length_spinbox.value(), self.minor_tick_width_spinbox.value(),
+        )
+        text = (self.title_input.text(), self.x_label_input.text(), self.y_label_input.text())
+        return PlotLabel(data, style, axis, text)
+
+    def update_plot_text(self):
+        """ 只有標題或軸標籤文字改變時，直接修改既有的文字物件。 """
+        self.ax.title.set_text(self.title_input.text() or "多功能圖表")
+        if not self.box_checkbox.isChecked():
+            self.ax.xaxis.label.set_text(self.x_label_input.text())
+        self.ax.yaxis.label.set_text(self.y_label_input.text())
+        self.update_layout(self.last_plot_label)
+        self.canvas.draw_idle()
+
+    def update_layout(self, label):
+        """
+        只有在會影響版面的輸入 (數據範圍、文字、字體大小、刻度、畫布尺寸) 改變時才執行 tight_layout。
+        """
+        layout_label = (label.data, label.axis, label.text, self.box_checkbox.isChecked(), tuple(self.figure.get_size_inches()))
+        if layout_label == self.last_layout_label:
+            return
+        self.last_layout_label = layout_label
+        try:
+            self.figure.tight_layout()
+        except ValueError as e:
+            print(f"無法自動調整佈局: {e}")
 
     def update_plot(self):
+        """ 排程一次重繪；重複呼叫只會重新計時，於最後一次請求後才實際重繪。 """
+        if self.is_updating_ui:
+            return
+        self.replot_timer.start()
+
+    def smooth_inputs(self, x_data, y_data, high_quality):
+        """ 回傳 (快取鍵, x, y)，x 與 y 已轉為連續的 float64 陣列。 """
+        x_data = np.ascontiguousarray(x_data, dtype=np.float64)
+        y_data = np.ascontiguousarray(y_data, dtype=np.float64)
+        # 直接以緩衝區餵入雜湊，不用 tobytes() 複製並串接整個陣列
+        digest = hashlib.blake2b(digest_size=16)
+        digest.update(x_data)
+        digest.update(y_data)
+        key = (digest.digest(), high_quality)
+        return key, x_data, y_data
+
+    def store_smooth_curve(self, key, result):
+        self.smooth_cache[key] = result
+        if len(self.smooth_cache) > SMOOTH_CACHE_SIZE:
+            self.smooth_cache.popitem(last=False)
+
+    def smooth_curves(self, datasets, high_quality):
+        """
+        一次計算所有數值數據集的平滑曲線，回傳 {數據集索引: (x_smooth, y_smooth)}；無法平滑的數據集不在結果中。
+        每個數據集只雜湊一次，相同內容的結果取自快取；未命中的數據集多於一個且總點數夠大時才交給常駐執行緒池平行插值
+        (NumPy/SciPy 的運算會釋放 GIL)，少量數據的派送成本高於計算本身。
+        """
+        results, pending = {}, {}
+        for i, ds in enumerate(datasets):
+            if not (ds['numeric_x'] and ds['numeric_y'] and len(ds['y'])):
+                continue
+            key, x_data, y_data = self.smooth_inputs(ds['x'], ds['y'], high_quality)
+            if (cached := self.smooth_cache.get(key)) is not None:
+                self.smooth_cache.move_to_end(key)
+                results[i] = cached
+            else:
+                pending[i] = (key, x_data, y_data)
+
+        if len(pending) > 1 and sum(len(x_data) for _, x_data, _ in pending.values()) >= PARALLEL_SMOOTH_MIN_POINTS:
+            futures = {i: self.smooth_executor.submit(compute_smooth_curve, x_data, y_data, high_quality)
+                       for i, (_, x_data, y_data) in pending.items()}
+            compute = lambda i: futures[i].result()
+        else:
+            compute = lambda i: compute_smooth_curve(*pending[i][1:], high_quality)
+        for i, (key, _, _) in pending.items():
+            try:
+                results[i] = compute(i)
+            except Exception as e:
+                print(f"無法生成平滑曲線: {e}")
+                continue
+            self.store_smooth_curve(key, results[i])
+        return results
+
+    def flush_plot(self):
+        """ 若有排程中的重繪，立即執行 (用於匯出等需要最新圖面的操作)。 """
+        if self.replot_timer.isActive():
+            self.replot_timer.stop()
+            self.do_update_plot()
+        if self.restyle_timer.isActive():
+            self.restyle_timer.stop()
+            self.do_restyle_plot()
+
+    @contextmanager
+    def batched_updates(self, widgets=()):
+        """
+        在區塊內批次修改介面元件，期間不排程重繪；可巢狀使用。
+        傳入 widgets 時一併暫停其訊號，離開區塊後恢復原本的狀態。
+        """
+        previous = self.is_updating_ui
+        self.is_updating_ui = True
+        was_blocked = [w.blockSignals(True) for w in widgets]
+        try:
+            yield
+        finally:
+            for w, blocked in zip(widgets, was_blocked):
+                w.blockSignals(blocked)
+            self.is_updating_ui = previous
+
+    def do_update_plot(self):
         """ 根據當前數據和設定更新繪圖。 """
         if self.is_updating_ui:
             return
+
+        label, last_label = self.build_plot_label(), self.last_plot_label
+        self.last_plot_label = label
+        if label == last_label:
+            return
+        if last_label is not None and self.datasets and (label.data, label.style, label.axis) == (last_label.data, last_label.style, last_label.axis):
+            self.update_plot_text()
+            return
             
         for handler in self.draggable_handlers:
             handler.disconnect()
         self.draggable_handlers.clear()
         
         self.ax.clear()
+        # ax.clear() 已移除圖例；未重新建立前不可再當作疊加 artist 繪製
+        self.legend = None
         self.artists_map = {}
+        self.annotations = []
+        self.median_annotations = []
+        self.data_label_artists = {}
+        self.label_specs = []
+        self.blit_background = None
         self.figure.set_facecolor(self.bg_color_hex)
         self.ax.set_facecolor(self.bg_color_hex)
         
@@ -771,144 +1519,173 @@ class PlottingApp(QMainWindow):
 
         if not self.datasets or (self.data_source == 'file' and not self.y_col_list.selectedItems()):
             self.ax.set_title("請輸入或選擇數據以繪製圖表")
-            self.canvas.draw()
+            self.canvas.draw_idle()
             return
 
-        all_x_numeric = True
-        if self.datasets and self.datasets[0]['x']:
-             all_x_numeric = all(isinstance(x, (int, float)) for x in self.datasets[0]['x'])
+        all_x_numeric = self.datasets[0]['numeric_x']
             
-        for dataset_index, dataset in enumerate(self.datasets):
+        # 迴圈內不變的介面設定只讀取一次
+        default_marker = self.marker_combo.currentText()
+        default_linewidth = self.line_width_spinbox.value()
+        default_linestyle = self.linestyle_combo.currentText()
+        point_area = self.point_size_spinbox.value()**2
+        border_width = self.border_width_spinbox.value()
+        bar_width = self.bar_width_spinbox.value()
+        label_size = self.data_label_size_spinbox.value()
+        is_line, is_scatter = self.line_checkbox.isChecked(), self.scatter_checkbox.isChecked()
+        is_bar, is_box = self.bar_checkbox.isChecked(), self.box_checkbox.isChecked()
+        show_labels = self.show_data_labels_checkbox.isChecked()
+        show_x_labels, show_y_labels = self.show_x_labels_checkbox.isChecked(), self.show_y_labels_checkbox.isChecked()
+        x_decimals, y_decimals = self.x_decimal_spinbox.value(), self.y_decimal_spinbox.value()
+        draws_line = is_line or (is_scatter and self.connect_scatter_checkbox.isChecked())
+        # 未啟用平滑時完全略過平滑相關的準備工作
+        smooth = draws_line and SCIPY_AVAILABLE and self.smooth_line_checkbox.isChecked()
+        high_quality = smooth and self.hq_smooth_checkbox.isChecked()
+
+        # 沒有勾選任何圖表類型且不顯示數據標籤時，不需逐一處理數據集
+        datasets_to_draw = self.datasets if (is_line or is_scatter or is_bar or is_box or show_labels) else []
+
+        smooth_results = self.smooth_curves(datasets_to_draw, high_quality) if smooth else {}
+
+        artist_cache = {}
+        drew_box = False
+        for dataset_index, dataset in enumerate(datasets_to_draw):
             x_data, y_data, colors, name = dataset['x'], dataset['y'], dataset['colors'], dataset['name']
             
             primary_color = dataset.get('primary_color', self.line_color_hex)
-            line_segment_colors = dataset.get('line_segment_colors', [primary_color] * (len(x_data) - 1))
+            # 預設值只在缺少時才建立，不在每次重繪時先產生一份長度為點數的清單
+            line_segment_colors = dataset.get('line_segment_colors')
             border_color = dataset.get('border_color', self.border_color_hex)
-            marker_style = dataset.get('marker', self.marker_combo.currentText())
-            linewidth = dataset.get('linewidth', self.line_width_spinbox.value())
-            linestyle_text = dataset.get('linestyle', self.linestyle_combo.currentText())
-            linestyle_map = {"實線": "-", "虛線": "--", "點虛線": "-.", "點": ":"}
-            ls = linestyle_map.get(linestyle_text, '-')
-
-            y_is_numeric = all(isinstance(y, (int, float)) for y in y_data)
-            x_is_numeric = all(isinstance(x, (int, float)) for x in x_data)
-            
-            if not y_data: continue
-
-            x_plot_data = x_data if x_is_numeric else range(len(x_data))
+            marker_style = dataset.get('marker', default_marker)
+            linewidth = dataset.get('linewidth', default_linewidth)
+            ls = LINESTYLE_MAP.get(dataset.get('linestyle', default_linestyle), '-')
 
-            if self.line_checkbox.isChecked() or (self.scatter_checkbox.isChecked() and self.connect_scatter_checkbox.isChecked()):
-                if x_is_numeric and y_is_numeric and SCIPY_AVAILABLE and self.smooth_line_checkbox.isChecked():
-                    try:
-                        sorted_indices = np.argsort(x_data)
-                        sorted_x = np.array(x_data)[sorted_indices]
-                        sorted_y = np.array(y_data)[sorted_indices]
-                        
-                        unique_x, _, _ = np.unique(sorted_x, return_index=True, return_counts=True)
-                        if len(unique_x) < 2: raise ValueError("需要至少兩個不同的數據點來生成平滑曲線。")
+            y_is_numeric, x_is_numeric = dataset['numeric_y'], dataset['numeric_x']
+            
+            if not len(y_data): continue
 
-                        if len(unique_x) < len(sorted_x):
-                            final_y = [np.mean(sorted_y[sorted_x == x_val]) for x_val in unique_x]
-                            final_x, final_y = unique_x, np.array(final_y)
-                        else:
-                            final_x, final_y = sorted_x, sorted_y
+            x_plot_data = x_data if x_is_numeric else np.arange(len(x_data))
+            # (N, 2) 座標陣列於折線與散佈點之間共用，只組合一次
+            points = None
 
-                        interpolator = PchipInterpolator(final_x, final_y)
-                        x_smooth = np.linspace(min(final_x), max(final_x), 300)
-                        y_smooth = interpolator(x_smooth)
-                        
-                        line_artist, = self.ax.plot(x_smooth, y_smooth, linestyle='-', color=primary_color,
-                                    linewidth=linewidth, zorder=1, label=f"{name} (平滑曲線)")
-                        self.artists_map[line_artist] = {'dataset_index': dataset_index, 'type': 'line'}
-                        legend_handles.append(line_artist)
-                        legend_labels.append(name)
-                    except Exception as e:
-                        print(f"無法生成平滑曲線: {e}")
-                        line_artist, = self.ax.plot(x_plot_data, y_data, color=primary_color, linewidth=linewidth,
-                                        linestyle=ls, zorder=1, label=name)
-                        self.artists_map[line_artist] = {'dataset_index': dataset_index, 'type': 'line'}
-                        legend_handles.append(line_artist)
-                        legend_labels.append(name)
+            if draws_line:
+                if smooth and x_is_numeric and y_is_numeric:
+                    if (curve := smooth_results.get(dataset_index)) is not None:
+                        line_artist = self.cached_line(artist_cache, (dataset_index, 'smooth'), *curve,
+                                                       primary_color, linewidth, '-', f"{name} (平滑曲線)")
+                    else:
+                        # 無法平滑 (例如唯一 x 值少於兩個) 時改畫一般折線
+                        line_artist = self.cached_line(artist_cache, (dataset_index, 'plain'), x_plot_data, y_data,
+                                                       primary_color, linewidth, ls, name)
+                    self.artists_map[line_artist] = {'dataset_index': dataset_index, 'type': 'line', 'smooth': curve is not None}
+                    legend_handles.append(line_artist)
+                    legend_labels.append(name)
                 elif y_is_numeric:
-                    points = np.array([x_plot_data, y_data]).T.reshape(-1, 1, 2)
-                    segments = np.concatenate([points[:-1], points[1:]], axis=1)
+                    points = np.column_stack([x_plot_data, y_data])
                     
-                    if len(line_segment_colors) != len(segments):
-                        line_segment_colors = [primary_color] * len(segments)
+                    if line_segment_colors is None or len(line_segment_colors) != len(points) - 1:
+                        line_segment_colors = segment_colors(primary_color, len(points))
                         dataset['line_segment_colors'] = line_segment_colors
 
-                    lc = LineCollection(segments, colors=line_segment_colors, linewidths=linewidth, linestyle=ls, zorder=1)
+                    seg_colors = np.asarray(line_segment_colors)
+                    kept = self.line_point_indices(x_plot_data, y_data)
+                    segments, drawn_colors = line_segments(points, seg_colors, kept)
+                    segment_rgba = rgba_colors(drawn_colors)
+                    if (lc := self.artist_cache.get((dataset_index, 'line'))) is None:
+                        lc = LineCollection(segments, colors=segment_rgba, linewidths=linewidth, linestyle=ls, zorder=1)
+                    else:
+                        lc.set_segments(segments)
+                        lc.set_colors(segment_rgba)
+                        lc.set_linewidths(linewidth)
+                        lc.set_linestyle(ls)
+                        lc.set_clip_path(self.ax.patch)
+                    artist_cache[(dataset_index, 'line')] = lc
                     line_artist = self.ax.add_collection(lc)
                     
-                    proxy_line, = self.ax.plot([], [], color=primary_color, linestyle=ls, label=name)
+                    # 圖例用的空線條也與其他 artist 一樣跨重繪重用 (linewidth 為 None 時使用預設線寬)
+                    proxy_line = self.cached_line(artist_cache, (dataset_index, 'proxy'), [], [], primary_color, None, ls, name)
                     self.artists_map[line_artist] = {'dataset_index': dataset_index, 'type': 'line', 'proxy_artist': proxy_line}
+                    if kept is not None:
+                        # 抽樣後的線段索引需對應回原始點索引；縮放時以 line_data 重新抽樣
+                        self.artists_map[line_artist].update(point_indices=kept, coarse_indices=kept, line_data=(points, seg_colors))
                     legend_handles.append(proxy_line)
                     legend_labels.append(name)
 
-            if self.scatter_checkbox.isChecked() or (self.line_checkbox.isChecked() and marker_style != "無"):
+            if is_scatter or (is_line and marker_style != "無"):
                 if y_is_numeric:
-                    marker_map = {"圓形": "o", "方形": "s", "三角形": "^", "星形": "*", "無": "None"}
-                    marker = marker_map.get(marker_style, 'o')
+                    marker = MARKER_MAP.get(marker_style, 'o')
                     if marker != "None":
-                        scatter = self.ax.scatter(x_plot_data, y_data, s=self.point_size_spinbox.value()**2, marker=marker,
-                                                    c=colors, edgecolors=border_color,
-                                                    linewidths=self.border_width_spinbox.value(), zorder=2)
+                        point_rgba = rgba_colors(colors)
+                        if (scatter := self.artist_cache.get((dataset_index, 'scatter', marker))) is None:
+                            scatter = self.ax.scatter(x_plot_data, y_data, s=point_area, marker=marker,
+                                                        facecolors=point_rgba, edgecolors=border_color,
+                                                        linewidths=border_width, zorder=2)
+                        else:
+                            scatter.set_offsets(points if points is not None else np.column_stack([x_plot_data, y_data]))
+                            scatter.set_sizes([point_area])
+                            scatter.set_facecolors(point_rgba)
+                            scatter.set_edgecolors(border_color)
+                            scatter.set_linewidths(border_width)
+                            scatter.set_clip_path(self.ax.patch)
+                            self.ax.add_collection(scatter)
+                        artist_cache[(dataset_index, 'scatter', marker)] = scatter
                         self.artists_map[scatter] = {'dataset_index': dataset_index, 'type': 'scatter'}
-                        if not self.line_checkbox.isChecked():
+                        if not is_line:
                             legend_handles.append(scatter)
                             legend_labels.append(name)
 
-            if self.bar_checkbox.isChecked():
+            if is_bar:
                 if y_is_numeric:
-                    bars = self.ax.bar(x_plot_data, y_data, width=self.bar_width_spinbox.value(), 
-                                       color=colors, edgecolor=border_color, linewidth=self.border_width_spinbox.value(), zorder=2, label=name)
-                    for rect in bars: self.artists_map[rect] = {'dataset_index': dataset_index, 'type': 'bar'}
+                    bars = self.ax.bar(x_plot_data, y_data, width=bar_width, 
+                                       color=colors, edgecolor=border_color, linewidth=border_width, zorder=2, label=name)
+                    # 同一數據集的長條共用一份資訊 dict，不為每根長條各建一個
+                    self.artists_map.update(dict.fromkeys(bars, {'dataset_index': dataset_index, 'type': 'bar'}))
                     legend_handles.append(bars[0])
                     legend_labels.append(name)
                 else:
                     print("長條圖需要數值型Y軸數據。")
                         
-            if self.box_checkbox.isChecked():
+            if is_box:
                 if y_is_numeric:
                     box_plot = self.ax.boxplot(y_data, patch_artist=True, positions=[dataset_index + 1])
                     for patch in box_plot['boxes']: patch.set_facecolor(primary_color)
-                    self.ax.set_xticks(range(1, len(self.datasets) + 1))
-                    self.ax.set_xticklabels([ds['name'] for ds in self.datasets])
+                    drew_box = True
                 else:
                     print("盒鬚圖需要數值型數據。")
                 
-            if self.show_data_labels_checkbox.isChecked():
-                if not self.box_checkbox.isChecked():
-                    for i, (x, y) in enumerate(zip(x_data, y_data)):
-                        label_parts = []
-                        if self.show_x_labels_checkbox.isChecked(): 
-                            label_parts.append(f"{x:.{self.x_decimal_spinbox.value()}f}" if isinstance(x, (int, float)) else f"{x}")
-                        if self.show_y_labels_checkbox.isChecked(): 
-                            label_parts.append(f"{y:.{self.y_decimal_spinbox.value()}f}" if isinstance(y, (int, float)) else f"{y}")
-                        label_text = ", ".join(label_parts)
-                        if label_text:
-                            my_id = (dataset_index, i)
-                            annot_x = x_plot_data[i]
-                            if my_id in self.annotation_positions:
-                                pos = self.annotation_positions[my_id]
-                                annot = self.ax.annotate(label_text, (annot_x, y), xytext=pos, textcoords='data', ha='center',
-                                                            fontsize=self.data_label_size_spinbox.value(), color=colors[i])
-                            else:
-                                annot = self.ax.annotate(label_text, (annot_x, y), textcoords="offset points", xytext=(0, 10), ha='center',
-                                                            fontsize=self.data_label_size_spinbox.value(), color=colors[i])
-                            annot.my_id = my_id
-                            self.annotations.append(annot)
+            if show_labels:
+                if not is_box:
+                    n_labels = min(len(x_data), len(y_data))
+                    label_columns = []
+                    if show_x_labels:
+                        label_columns.append(format_values(x_data[:n_labels], x_decimals, x_is_numeric))
+                    if show_y_labels:
+                        label_columns.append(format_values(y_data[:n_labels], y_decimals, y_is_numeric))
+                    labels = join_labels(label_columns)
+                    # 標籤於座標範圍確定後才由 create_data_labels 依可視範圍建立
+                    self.label_specs.append((dataset_index, x_plot_data, y_data, labels, colors, y_is_numeric))
                 elif y_is_numeric:
                     median_val = np.median(y_data)
-                    annot = self.ax.annotate(f"中位數: {median_val:.{self.y_decimal_spinbox.value()}f}", 
+                    annot = self.ax.annotate(f"中位數: {median_val:.{y_decimals}f}", 
                                                 xy=(dataset_index + 1, median_val),
                                                 xytext=(10, 0), textcoords='offset points',
-                                                fontsize=self.data_label_size_spinbox.value(), color='black')
-                    self.annotations.append(annot)
+                                                fontsize=label_size, color='black')
+                    self.median_annotations.append(annot)
+
+        if drew_box:
+            # 盒鬚圖的 X 軸刻度涵蓋所有數據集，迴圈結束後設定一次即可
+            self.ax.set_xticks(range(1, len(self.datasets) + 1))
+            self.ax.set_xticklabels([ds['name'] for ds in self.datasets])
+
+        self.artist_cache = artist_cache
+        self.ax.autoscale_view()
+        self.create_data_labels()
+        self.ax.callbacks.connect('xlim_changed', self.on_axes_limits_changed)
+        self.ax.callbacks.connect('ylim_changed', self.on_axes_limits_changed)
 
         title_obj = self.ax.set_title(self.title_input.text() or "多功能圖表")
         
-        if not self.box_checkbox.isChecked():
+        if not is_box:
             xlabel_obj = self.ax.set_xlabel(self.x_label_input.text(), color=self.x_label_color_hex,
                                             weight='bold' if self.x_label_bold_checkbox.isChecked() else 'normal',
                                             fontsize=self.x_label_size_spinbox.value())
@@ -923,30 +1700,28 @@ class PlottingApp(QMainWindow):
         self.draggable_handlers.append(DraggableArtist(xlabel_obj, self.canvas))
         self.draggable_handlers.append(DraggableArtist(ylabel_obj, self.canvas))
 
-        tick_direction_map = {"朝外": "out", "朝內": "in", "朝內外": "inout"}
-        tick_dir = tick_direction_map.get(self.tick_direction_combo.currentText(), "out")
-
-        self.ax.tick_params(axis='both', which='major', direction=tick_dir,
-                                length=self.major_tick_length_spinbox.value(),
-                                width=self.major_tick_width_spinbox.value())
-        
-        self.ax.tick_params(axis='x', labelsize=self.x_tick_label_size_spinbox.value())
-        self.ax.tick_params(axis='y', labelsize=self.y_tick_label_size_spinbox.value())
+        tick_dir = TICK_DIRECTION_MAP.get(self.tick_direction_combo.currentText(), "out")
+        tick_length, tick_width = self.major_tick_length_spinbox.value(), self.major_tick_width_spinbox.value()
 
-        plt.setp(self.ax.get_xticklabels(), 
-                 fontweight='bold' if self.x_tick_label_bold_checkbox.isChecked() else 'normal',
-                 rotation=self.x_tick_rotation_spinbox.value())
-        plt.setp(self.ax.get_yticklabels(), 
-                 fontweight='bold' if self.y_tick_label_bold_checkbox.isChecked() else 'normal',
-                 rotation=self.y_tick_rotation_spinbox.value())
+        # 每軸只呼叫一次 tick_params；其設定同時套用到之後縮放時新建的刻度
+        for axis, label_size, bold, rotation in (
+            (self.ax.xaxis, self.x_tick_label_size_spinbox.value(), self.x_tick_label_bold_checkbox.isChecked(), self.x_tick_rotation_spinbox.value()),
+            (self.ax.yaxis, self.y_tick_label_size_spinbox.value(), self.y_tick_label_bold_checkbox.isChecked(), self.y_tick_rotation_spinbox.value()),
+        ):
+            axis.set_tick_params(which='major', direction=tick_dir,
+                                 length=tick_length, width=tick_width,
+                                 labelsize=label_size, labelrotation=rotation)
+            # 粗體無法經由 tick_params 設定：只設定第一個刻度，之後建立的刻度會複製其文字屬性，
+            # 不必像 get_xticklabels() 那樣先執行 locator 計算出所有刻度
+            axis.get_major_ticks(1)[0].label1.set_fontweight('bold' if bold else 'normal')
         
-        all_y_numeric = all(isinstance(y, (int, float)) for ds in self.datasets for y in ds['y'])
+        all_y_numeric = all(ds['numeric_y'] for ds in self.datasets)
 
-        all_x_values = [x for ds in self.datasets for x in ds['x'] if isinstance(x, (int, float))]
-        all_y_values = [y for ds in self.datasets for y in ds['y'] if isinstance(y, (int, float))]
+        all_x_values = [ds['x'] for ds in self.datasets if ds['numeric_x'] and len(ds['x'])]
+        all_y_values = [ds['y'] for ds in self.datasets if ds['numeric_y'] and len(ds['y'])]
 
-        x_min, x_max = (min(all_x_values), max(all_x_values)) if all_x_values else (0, 1)
-        y_min, y_max = (min(all_y_values), max(all_y_values)) if all_y_values else (0, 1)
+        x_min, x_max = (min(np.nanmin(a) for a in all_x_values), max(np.nanmax(a) for a in all_x_values)) if all_x_values else (0, 1)
+        y_min, y_max = (min(np.nanmin(a) for a in all_y_values), max(np.nanmax(a) for a in all_y_values)) if all_y_values else (0, 1)
         
         x_range = x_max - x_min if x_max > x_min else 1
         y_range = y_max - y_min if y_max > y_min else 1
@@ -955,7 +1730,7 @@ class PlottingApp(QMainWindow):
 
         if all_x_numeric:
             x_interval = self.x_interval_spinbox.value()
-            if x_interval > 0 and not self.box_checkbox.isChecked():
+            if x_interval > 0 and not is_box:
                 if (x_range / x_interval) < MAX_TICKS_LIMIT:
                     self.ax.xaxis.set_major_locator(ticker.MultipleLocator(x_interval))
                 else:
@@ -963,18 +1738,17 @@ class PlottingApp(QMainWindow):
                     self.ax.xaxis.set_major_locator(ticker.MaxNLocator(nbins='auto', prune='both'))
             
             minor_x_interval = self.minor_x_interval_spinbox.value()
-            if minor_x_interval > 0 and not self.box_checkbox.isChecked():
+            if minor_x_interval > 0 and not is_box:
                 if (x_range / minor_x_interval) < (MAX_TICKS_LIMIT * 5): 
                      self.ax.xaxis.set_minor_locator(ticker.MultipleLocator(minor_x_interval))
                 else:
                      self.ax.xaxis.set_minor_locator(ticker.NullLocator()) 
 
-        elif self.datasets and not self.box_checkbox.isChecked():
+        elif self.datasets and not is_box:
             interval = max(1, int(self.x_interval_spinbox.value()))
             x_labels = self.datasets[0]['x']
-            tick_positions = range(0, len(x_labels), interval)
-            tick_labels = [x_labels[i] for i in tick_positions]
-            self.ax.set_xticks(tick_positions, tick_labels)
+            # x 欄已是陣列，以步長切片直接取得刻度文字 (視圖，不逐項索引)
+            self.ax.set_xticks(np.arange(0, len(x_labels), interval), x_labels[::interval].tolist())
 
         if all_y_numeric:
             y_interval = self.y_interval_spinbox.value()
@@ -1005,45 +1779,304 @@ class PlottingApp(QMainWindow):
         else:
             self.ax.minorticks_off()
 
+        self.legend_entries = (legend_handles, legend_labels)
         if legend_handles and legend_labels:
             self.legend = self.ax.legend(handles=legend_handles, labels=legend_labels, prop={'size': self.legend_size_spinbox.value()}, draggable=True)
         else:
             self.legend = None
 
-        try:
-            self.figure.tight_layout()
-        except ValueError as e:
-            print(f"無法自動調整佈局: {e}")
-        self.canvas.draw()
+        # 數據 artist 設為 animated，使其不進入背景快取，之後的樣式調整可直接 blit；
+        # 一般繪製時疊在數據之上的框線、座標軸與圖例也一併設為 animated，才能依 zorder 畫在正確的層次
+        for artist in list(self.artists_map) + self.annotations + self.overlay_artists():
+            artist.set_animated(True)
+
+        self.update_layout(label)
+        self.canvas.draw_idle()
+
+    def cached_line(self, artist_cache, key, x, y, color, linewidth, linestyle, label):
+        """ 重用上次繪圖的 Line2D 並以 set_data 更新；沒有快取時才以 ax.plot 建立。 """
+        if (line := self.artist_cache.get(key)) is None:
+            line, = self.ax.plot(x, y, color=color, linewidth=linewidth, linestyle=linestyle, zorder=1, label=label)
+        else:
+            line.set_data(x, y)
+            line.set_color(color)
+            line.set_linewidth(linewidth)
+            line.set_linestyle(linestyle)
+            line.set_label(label)
+            line.set_clip_path(self.ax.patch)
+            self.ax.add_line(line)
+        artist_cache[key] = line
+        return line
+
+    def create_data_labels(self):
+        """
+        只為目前座標範圍內的數據點建立數據標籤，並移除已離開範圍的標籤。
+        回傳標籤集合是否有變動。
+        """
+        (x_lo, x_hi), (y_lo, y_hi) = sorted(self.ax.get_xlim()), sorted(self.ax.get_ylim())
+        label_size = self.data_label_size_spinbox.value()
+        wanted, changed = set(), False
+        visible_rows = []
+        for ds_index, x_arr, y_arr, labels, colors, y_is_numeric in self.label_specs:
+            if y_is_numeric:
+                x_pos, y_pos = x_arr[:len(labels)], y_arr[:len(labels)]
+                visible_rows.append(np.nonzero((x_pos >= x_lo) & (x_pos <= x_hi) & (y_pos >= y_lo) & (y_pos <= y_hi))[0])
+            else:
+                visible_rows.append(np.arange(len(labels)))
+        # 超過上限時只保留索引為 step 倍數的點，平移時同一點的標籤不會忽隱忽現
+        total = sum(len(rows) for rows in visible_rows)
+        step = -(-total // MAX_DATA_LABELS) if self.limit_labels_checkbox.isChecked() and total > MAX_DATA_LABELS else 1
+        self.limit_labels_checkbox.setText(f"最多 {MAX_DATA_LABELS} 個" + (f" (每 {step} 點顯示 1 個)" if step > 1 else ""))
+        for (ds_index, x_arr, y_arr, labels, colors, y_is_numeric), visible in zip(self.label_specs, visible_rows):
+            if step > 1:
+                visible = visible[visible % step == 0]
+            for i in visible:
+                if not (label_text := labels[i]):
+                    continue
+                my_id = (ds_index, int(i))
+                wanted.add(my_id)
+                if my_id in self.data_label_artists:
+                    continue
+                if my_id in self.annotation_positions:
+                    annot = self.ax.annotate(label_text, (x_arr[i], y_arr[i]), xytext=self.annotation_positions[my_id], textcoords='data', ha='center',
+                                             fontsize=label_size, color=colors[i])
+                else:
+                    annot = self.ax.annotate(label_text, (x_arr[i], y_arr[i]), textcoords="offset points", xytext=(0, 10), ha='center',
+                                             fontsize=label_size, color=colors[i])
+                annot.my_id = my_id
+                annot.set_animated(True)
+                self.data_label_artists[my_id] = annot
+                changed = True
+        for my_id in [k for k in self.data_label_artists if k not in wanted]:
+            self.data_label_artists.pop(my_id).remove()
+            changed = True
+        self.annotations = self.median_annotations + list(self.data_label_artists.values())
+        return changed
+
+    def on_axes_limits_changed(self, ax):
+        """ 縮放或平移時合併多次範圍變更，稍後再重新篩選可視的數據標籤並重新抽樣折線。 """
+        if self.label_specs or any('point_indices' in info for info in self.artists_map.values()):
+            self.label_cull_timer.start()
+
+    def refresh_data_labels(self):
+        lines_changed = self.refresh_decimated_lines()
+        if self.create_data_labels() or lines_changed:
+            self.canvas.draw_idle()
+
+    def decimate_buckets(self):
+        """ 抽樣區段數：約每個水平像素一段。 """
+        return max(int(self.ax.bbox.width), 100)
+
+    def line_point_indices(self, x, y):
+        """ 大型且 x 遞增的折線回傳全範圍的抽樣點索引；不需抽樣時回傳 None。 """
+        if len(x) <= DECIMATE_MIN_POINTS or not np.all(x[1:] >= x[:-1]):
+            return None
+        return minmax_indices(x, y, x[0], x[-1], self.decimate_buckets())
+
+    def refresh_decimated_lines(self):
+        """
+        依目前的 x 範圍重新抽樣折線：可視範圍內以畫面解析度取點，
+        範圍外沿用全範圍的粗略抽樣，平移時仍有線段可顯示。回傳是否有折線被更新。
+        """
+        x_min, x_max = sorted(self.ax.get_xlim())
+        changed = False
+        for artist, info in self.artists_map.items():
+            if 'point_indices' not in info:
+                continue
+            points, seg_colors = info['line_data']
+            visible = minmax_indices(points[:, 0], points[:, 1], x_min, x_max, self.decimate_buckets())
+            kept = np.union1d(info['coarse_indices'], visible)
+            if np.array_equal(kept, info['point_indices']):
+                continue
+            segments, drawn_colors = line_segments(points, seg_colors, kept)
+            artist.set_segments(segments)
+            artist.set_colors(rgba_colors(drawn_colors))
+            info['point_indices'] = kept
+            changed = True
+        return changed
+
+    def overlay_artists(self):
+        """ 回傳一般繪製時可能疊在數據 artist 之上的框線、座標軸 (含格線與刻度) 與圖例。 """
+        artists = [*self.ax.spines.values(), self.ax.xaxis, self.ax.yaxis]
+        if self.legend is not None:
+            artists.append(self.legend)
+        return artists
+
+    def animated_artists(self):
+        """ 依 zorder 排序回傳所有 animated 的數據 artist 與疊加 artist (與一般繪製的堆疊順序相同)。 """
+        artists = [a for a in list(self.artists_map) + self.annotations + self.overlay_artists() if a.get_animated()]
+        return sorted(artists, key=lambda a: a.get_zorder())
+
+    def on_draw_event(self, event):
+        """ 完整重繪後快取背景，並補畫 animated artist。 """
+        self.annotation_boxes = None
+        self.drag_background = None
+        # 存檔時 Axes.draw 會依 zorder 一併繪製 animated artist，不可再補畫一次
+        if self.canvas.is_saving():
+            return
+        if event.renderer is self.canvas.get_renderer():
+            self.blit_background = self.canvas.copy_from_bbox(self.figure.bbox)
+        for artist in self.animated_artists():
+            artist.draw(event.renderer)
+
+    def restyle_plot(self):
+        """ 排程一次外觀調整；按住 spinbox 連續變更時合併為每個畫面週期一次 blit。 """
+        if self.is_updating_ui:
+            return
+        self.restyle_timer.start()
+
+    def do_restyle_plot(self):
+        """ 只調整既有 artist 的外觀 (點大小、邊框粗度、數據標籤大小)，並以 blit 重繪。 """
+        if self.blit_background is None:
+            self.update_plot()
+            return
+
+        point_size = self.point_size_spinbox.value()**2
+        border_width = self.border_width_spinbox.value()
+        for artist, info in self.artists_map.items():
+            if info['type'] == 'scatter':
+                artist.set_sizes([point_size])
+                artist.set_linewidths(border_width)
+            elif info['type'] == 'bar':
+                artist.set_linewidth(border_width)
+
+        label_size = self.data_label_size_spinbox.value()
+        for annot in self.annotations:
+            annot.set_fontsize(label_size)
+
+        self.blit_artists()
+
+    def restyle_legend(self):
+        """ 只以新的字體大小重建圖例，不清除並重建整張圖表。 """
+        if self.is_updating_ui:
+            return
+        if self.replot_timer.isActive():
+            self.update_plot()
+            return
+        if self.legend is None:
+            return
+        self.rebuild_legend()
+        self.canvas.draw_idle()
+
+    def rebuild_legend(self):
+        """ 以保存的 handles/labels 重建圖例，不影響其他 artist。 """
+        handles, labels = self.legend_entries
+        self.legend.remove()
+        self.legend = self.ax.legend(handles=handles, labels=labels, prop={'size': self.legend_size_spinbox.value()}, draggable=True)
+        self.legend.set_animated(True)
+
+    def apply_point_colors(self, ds_indices):
+        """ 將數據集的點顏色直接套用到既有的散佈點、長條與數據標籤上，不重建圖表；所有數據集處理完後只重繪一次。 """
+        ds_indices = set(ds_indices)
+        bars = {i: [] for i in ds_indices}
+        for artist, info in self.artists_map.items():
+            if info['dataset_index'] not in ds_indices:
+                continue
+            if info['type'] == 'scatter':
+                artist.set_facecolors(rgba_colors(self.datasets[info['dataset_index']]['colors']))
+            elif info['type'] == 'bar':
+                bars[info['dataset_index']].append(artist)
+        for ds_index, rects in bars.items():
+            for rect, color in zip(rects, self.datasets[ds_index]['colors']):
+                rect.set_facecolor(color)
+        for annot in self.annotations:
+            if (my_id := getattr(annot, 'my_id', None)) is not None and my_id[0] in ds_indices:
+                annot.set_color(self.datasets[my_id[0]]['colors'][my_id[1]])
+
+        if self.blit_background is not None:
+            self.blit_artists()
+        else:
+            self.canvas.draw_idle()
+
+    def blit_artists(self):
+        """ 還原背景快取後只重畫 animated artist。 """
+        self.canvas.restore_region(self.blit_background)
+        self.annotation_boxes = None
+        for artist in self.animated_artists():
+            self.figure.draw_artist(artist)
+        self.canvas.blit(self.figure.bbox)
         
     def update_table(self):
-        self.is_updating_table = True
-        if not self.datasets:
-            self.data_table.clearContents()
-            self.data_table.setRowCount(0)
-            self.data_table.setColumnCount(3)
-            self.data_table.setHorizontalHeaderLabels(["X 數據", "Y 數據", "顏色"])
-        else:
-            num_datasets = len(self.datasets)
-            self.data_table.setColumnCount(1 + num_datasets * 2)
-            headers = ["X 數據"] + [h for ds in self.datasets for h in (f"Y: {ds['name']}", "顏色")]
-            self.data_table.setHorizontalHeaderLabels(headers)
-            
-            max_rows = max(len(ds.get('x', [])) for ds in self.datasets) if self.datasets else 0
-            self.data_table.setRowCount(max_rows)
-            
-            for row in range(max_rows):
-                for i, ds in enumerate(self.datasets):
-                    if row < len(ds['x']):
-                        if i == 0: self.data_table.setItem(row, 0, QTableWidgetItem(str(ds['x'][row])))
-                        y_col, color_col = 1 + i * 2, 2 + i * 2
-                        self.data_table.setItem(row, y_col, QTableWidgetItem(str(ds['y'][row])))
-                        color_item = QTableWidgetItem('')
-                        color_item.setBackground(QColor(ds['colors'][row]))
-                        color_item.setFlags(color_item.flags() & ~Qt.ItemFlag.ItemIsEditable)
-                        self.data_table.setItem(row, color_col, color_item)
-        self.is_updating_table = False
+        """ 數據集的列數或內容整體改變後重新載入數據表格，並重新套用目前的篩選條件。 """
+        with self.table_batch():
+            reset = self.table_model.refresh()
+        text = self.filter_input.text()
+        if reset:
+            # 重設模型會清除檢視中所有隱藏列
+            self.hidden_rows = None
+            if text:
+                self.filter_table(text)
+        elif text or self.hidden_rows is not None:
+            # 列數未變時檢視仍保留原本的隱藏列，以新的內容重新比對並只更新狀態改變的列
+            self.filter_table(text)
+
+    @contextmanager
+    def table_batch(self):
+        """ 批次修改表格內容；期間暫停重繪，最外層結束時一次還原。可巢狀使用。 """
+        if self.table_update_depth == 0:
+            self.data_table.setUpdatesEnabled(False)
+        self.table_update_depth += 1
+        try:
+            yield
+        finally:
+            self.table_update_depth -= 1
+            if self.table_update_depth == 0:
+                self.data_table.setUpdatesEnabled(True)
+                self.data_table.viewport().update()
+            self.row_search_blobs = None
             
+    def update_table_colors(self, ds_indices=None, row=None):
+        """
+        只通知檢視重畫顏色欄位的背景色；數據文字未變動時使用，不必重新載入整張表格。
+        可只指定部分數據集的顏色欄，或其中的單一列。
+        """
+        model = self.table_model
+        for ds_index in range(len(self.datasets)) if ds_indices is None else ds_indices:
+            if (rows := len(self.datasets[ds_index]['colors'])) == 0:
+                continue
+            first, last = (0, rows - 1) if row is None else (row, row)
+            col = 2 * ds_index + 2
+            model.dataChanged.emit(model.index(first, col), model.index(last, col), [Qt.ItemDataRole.BackgroundRole])
+
+    def set_cell_texts(self, cells):
+        """
+        將 (列, 欄, 文字) 寫入數據集對應的欄位：X 欄寫入所有具有該列的數據集，Y 欄寫入對應的數據集。
+        同一欄位的所有文字一次轉換；全為數值且原欄位為數值時就地寫入，否則重新判斷整欄的型態。
+        """
+        by_col = {}
+        for row, col, text in cells:
+            rows, texts = by_col.setdefault(col, ([], []))
+            rows.append(row)
+            texts.append(text)
+
+        # 先依欄分組，再以陣列比較一次篩掉超出各數據集長度的列，不逐格檢查每個數據集
+        columns = {}
+        for col, (rows, texts) in by_col.items():
+            if col == 0:
+                targets = [(i, 'x') for i in range(len(self.datasets))]
+            elif col % 2 and (col - 1) // 2 < len(self.datasets):
+                targets = [((col - 1) // 2, 'y')]
+            else:
+                continue
+            rows, texts = np.asarray(rows), np.asarray(texts, dtype=object)
+            for ds_index, key in targets:
+                if (keep := rows < len(self.datasets[ds_index][key])).any():
+                    columns[(ds_index, key)] = (rows[keep], texts[keep])
+
+        for (ds_index, key), (rows, texts) in columns.items():
+            ds, flag = self.datasets[ds_index], f'numeric_{key}'
+            values = to_numeric_column(texts)
+            if ds[flag] and isinstance(values, np.ndarray):
+                writable_column(ds, key)[rows] = values
+            else:
+                merged = ds[key].astype(object)
+                if ds[f'integral_{key}']:
+                    # 整數欄位中的整數值以 int 放回，重新判斷型態後仍顯示為整數
+                    whole = whole_values(ds[key])
+                    merged[whole] = ds[key][whole].astype(np.int64).astype(object)
+                merged[rows] = np.asarray(values, dtype=object)
+                ds[key], ds[flag], ds[f'integral_{key}'] = as_column_array(merged)
+
     def toggle_plot_settings(self):
         is_line = self.line_checkbox.isChecked()
         is_scatter = self.scatter_checkbox.isChecked()
@@ -1054,6 +2087,7 @@ class PlottingApp(QMainWindow):
         
         for widget in [self.line_width_spinbox, self.line_width_label, self.linestyle_combo, self.linestyle_label, self.smooth_line_checkbox]:
             widget.setVisible(is_line_visible)
+        self.hq_smooth_checkbox.setVisible(is_line_visible and self.smooth_line_checkbox.isChecked())
         
         for widget in [self.point_size_spinbox, self.point_size_label, self.marker_combo, self.marker_label]:
             widget.setVisible(is_scatter or is_line)
@@ -1067,12 +2101,6 @@ class PlottingApp(QMainWindow):
         self.selected_artist_info = None
         self.clear_all_highlights()
 
-        for annotation in self.annotations:
-            if hasattr(annotation, 'is_temp_label'):
-                annotation.remove()
-        self.annotations = [a for a in self.annotations if not hasattr(a, 'is_temp_label')]
-        self.canvas.draw_idle()
-
         if event.button != 1 or event.xdata is None or event.ydata is None:
             return
 
@@ -1099,7 +2127,7 @@ class PlottingApp(QMainWindow):
         on_x = (abs(event.y - y_min_p) < 10 or abs(event.y - y_max_p) < 10) and (x_min_p <= event.x <= x_max_p)
 
         if on_x or on_y:
-            if not (content := self.axis_style_group.findChild(QWidget)).isVisible(): content.parent().findChild(QPushButton).click()
+            if not self.axis_style_group.content_widget.isVisible(): self.axis_style_group.toggle_button.click()
             self.control_tabs.setCurrentWidget(self.plot_settings_tab)
             self.highlight_widget(self.axis_style_group)
             self.plot_settings_scroll_area.ensureWidgetVisible(self.axis_style_group)
@@ -1115,63 +2143,103 @@ class PlottingApp(QMainWindow):
                 self.highlight_widget(self.style_group)
                 self.plot_settings_scroll_area.ensureWidgetVisible(self.style_group)
                 
-                try:
-                    self.is_updating_ui = True
+                with self.batched_updates(self.dataset_style_widgets):
                     ds_idx, artist_type = artist_info['dataset_index'], artist_info['type']
                     current_ds = self.datasets[ds_idx]
                     point_idx = -1
                     
                     if artist_type == 'line':
                         if isinstance(artist, LineCollection):
-                            x_plot_data = current_ds['x'] if all(isinstance(x, (int, float)) for x in current_ds['x']) else range(len(current_ds['x']))
-                            line_data = np.array([x_plot_data, current_ds['y']]).T
-                            if np.issubdtype(line_data.dtype, np.number):
-                                distances = np.sum((line_data - [event.xdata, event.ydata])**2, axis=1)
-                                point_idx = np.argmin(distances)
+                            # contains() 已回傳被點擊的線段索引，只需在該線段的兩端點中挑選較近者
+                            if len(seg_ind := details.get('ind', [])):
+                                seg_idx = int(seg_ind[0])
+                                seg = artist.get_segments()[seg_idx]
+                                click = np.array([event.xdata, event.ydata])
+                                point_idx = seg_idx + int(np.sum((seg[1] - click)**2) < np.sum((seg[0] - click)**2))
+                                if (kept := artist_info.get('point_indices')) is not None:
+                                    point_idx = int(kept[point_idx])
                             else:
                                 point_idx = -1
                         else:
-                            point_idx = np.argmin(np.sum((artist.get_xydata() - [event.xdata, event.ydata])**2, axis=1))
+                            x_arr, y_arr = self.dataset_xy_arrays(current_ds)
+                            point_idx = nearest_point_index(x_arr, y_arr, event.xdata, event.ydata)
                     elif artist_type == 'scatter': 
                         point_idx = details.get("ind", [0])[0]
                     elif artist_type == 'bar': 
                         bar_x_center = artist.get_x() + artist.get_width() / 2
-                        x_plot_data_numeric = range(len(current_ds['x'])) if not all(isinstance(x, (int, float)) for x in current_ds['x']) else current_ds['x']
-                        point_idx = (np.abs(np.array(x_plot_data_numeric) - bar_x_center)).argmin()
+                        x_arr, _ = self.dataset_xy_arrays(current_ds)
+                        point_idx = int(np.abs(x_arr - bar_x_center).argmin())
 
                     if point_idx != -1:
                         self.selected_artist_info = {'type': artist_type, 'dataset_index': ds_idx, 'point_index': point_idx}
-                        if (idx := self.marker_combo.findText(current_ds.get('marker', '無'))) != -1: self.marker_combo.setCurrentIndex(idx)
-                        if (idx := self.linestyle_combo.findText(current_ds.get('linestyle', '實線'))) != -1: self.linestyle_combo.setCurrentIndex(idx)
+                        self.set_combo_text(self.marker_combo, current_ds.get('marker', '無'))
+                        self.set_combo_text(self.linestyle_combo, current_ds.get('linestyle', '實線'))
                         self.line_width_spinbox.setValue(current_ds.get('linewidth', 2.0))
                         self.line_color_hex = current_ds.get('primary_color', '#1f77b4')
                         self.point_color_hex = current_ds.get('colors', [self.point_color_hex])[point_idx]
                         self.border_color_hex = current_ds.get('border_color', '#000000')
                         self.update_button_color()
                         self.update_series_combo()
-                finally:
-                    self.is_updating_ui = False
                 return
 
-        if any(annot.get_visible() and annot.contains(event)[0] for annot in self.annotations):
+        if next(self.annotations_at(event), None) is not None:
             return
         
         self.clear_all_highlights()
 
+    def dataset_xy_arrays(self, ds):
+        """ 取得數據集繪圖用的 (x, y) 數值陣列；非數值 X 以索引位置代替。 """
+        x_arr = ds['x'] if ds['numeric_x'] else np.arange(len(ds['x']), dtype=float)
+        return x_arr, np.asarray(ds['y'], dtype=float)
+
+    def annotations_at(self, event):
+        """
+        依序產生滑鼠位置下的可見標註。所有標註的邊界框在重繪後第一次查詢時一次算好，
+        之後每次點擊只需一次向量化比較，再對少數候選者呼叫 contains() 確認。
+        """
+        if self.annotation_boxes is None or self.annotation_boxes[0] is not self.annotations:
+            renderer = self.canvas.get_renderer()
+            boxes = np.array([annot.get_window_extent(renderer).extents for annot in self.annotations], dtype=float)
+            self.annotation_boxes = (self.annotations, boxes.reshape(-1, 4))
+        annotations, boxes = self.annotation_boxes
+        hits = np.flatnonzero((boxes[:, 0] <= event.x) & (event.x <= boxes[:, 2]) &
+                              (boxes[:, 1] <= event.y) & (event.y <= boxes[:, 3]))
+        for i in hits:
+            annot = annotations[i]
+            if annot.get_visible() and annot.contains(event)[0]:
+                yield annot
+
     def on_press_annotate(self, event):
         if event.button == 1 and event.inaxes:
-            for annot in self.annotations:
-                if annot.get_visible() and annot.contains(event)[0] and hasattr(annot, 'my_id'):
+            for annot in self.annotations_at(event):
+                if hasattr(annot, 'my_id'):
                     self.dragged_annotation = annot
+                    # 按下時凍結一次資料座標轉換及其反向轉換，之後的換算與整個拖曳過程都重複使用
+                    trans = self.ax.transData.frozen()
+                    self.drag_inverse_transform = trans.inverted()
                     
                     if annot.get_anncoords() == 'offset points':
-                        xy_pixels = self.ax.transData.transform(annot.xy)
-                        text_pos_pixels = xy_pixels + np.array(annot.xytext)
-                        annot.set_position(self.ax.transData.inverted().transform(text_pos_pixels))
+                        # xytext 以點 (1/72 英吋) 為單位，需依 dpi 換算為像素
+                        text_pos_pixels = trans.transform(annot.xy) + np.array(annot.xytext) * self.figure.dpi / 72
+                        annot.set_position(self.drag_inverse_transform.transform(text_pos_pixels))
                         annot.set_anncoords('data')
-                    
-                    text_pos_pixels = self.ax.transData.transform(annot.get_position())
+                    else:
+                        text_pos_pixels = trans.transform(annot.get_position())
                     self.drag_start_offset = (text_pos_pixels[0] - event.x, text_pos_pixels[1] - event.y)
+                    if self.blit_background is not None and annot.get_animated():
+                        # 其他 animated artist 在拖曳期間不會改變，先畫入拖曳背景，移動時只需重畫這一個標籤；
+                        # zorder 高於標籤的疊加 artist (圖例) 不放入背景，每次移動時畫在標籤之上
+                        self.canvas.restore_region(self.blit_background)
+                        self.drag_overlay = []
+                        for artist in self.animated_artists():
+                            if artist is annot:
+                                continue
+                            if artist.get_zorder() > annot.get_zorder() and artist in self.overlay_artists():
+                                self.drag_overlay.append(artist)
+                            else:
+                                self.figure.draw_artist(artist)
+                        self.drag_background = self.canvas.copy_from_bbox(self.figure.bbox)
+                        self.drag_extent = annot.get_window_extent()
                     break
 
     def on_motion_annotate(self, event):
@@ -1179,14 +2247,35 @@ class PlottingApp(QMainWindow):
             x_pixel_new = event.x + self.drag_start_offset[0]
             y_pixel_new = event.y + self.drag_start_offset[1]
             
-            new_pos_data = self.ax.transData.inverted().transform((x_pixel_new, y_pixel_new))
+            new_pos_data = self.drag_inverse_transform.transform((x_pixel_new, y_pixel_new))
             self.dragged_annotation.set_position(new_pos_data)
-            self.canvas.draw_idle()
+            # 數據標籤為 animated artist，拖曳時只需還原背景並重畫被拖曳的標籤
+            if self.drag_background is not None:
+                self.canvas.restore_region(self.drag_background)
+                self.figure.draw_artist(self.dragged_annotation)
+                for artist in self.drag_overlay:
+                    self.figure.draw_artist(artist)
+                # 只把標籤新舊位置涵蓋的區域送到螢幕，而非整張畫布
+                extent = self.dragged_annotation.get_window_extent()
+                self.canvas.blit(Bbox.union([self.drag_extent, extent]).padded(2))
+                self.drag_extent = extent
+            elif self.blit_background is not None and self.dragged_annotation.get_animated():
+                self.blit_artists()
+            else:
+                self.canvas.draw_idle()
 
     def on_release_annotate(self, event):
         if self.dragged_annotation and hasattr(self.dragged_annotation, 'my_id'):
             self.annotation_positions[self.dragged_annotation.my_id] = self.dragged_annotation.get_position()
+            if self.annotation_boxes is not None and self.annotation_boxes[0] is self.annotations:
+                # 只有被拖曳的標籤移動，更新其邊界框即可，不需在下一次點擊時重新計算所有標籤
+                annotations, boxes = self.annotation_boxes
+                boxes[annotations.index(self.dragged_annotation)] = self.dragged_annotation.get_window_extent().extents
         self.dragged_annotation = None
+        self.drag_inverse_transform = None
+        self.drag_background = None
+        self.drag_extent = None
+        self.drag_overlay = []
 
     def update_button_color(self):
         self.line_color_btn.setStyleSheet(f"background-color: {self.line_color_hex};")
@@ -1199,9 +2288,9 @@ class PlottingApp(QMainWindow):
         self.y_label_color_btn.setStyleSheet(f"background-color: {self.y_label_color_hex};")
         
     def pick_color(self, target):
-        initial_color_attr = f"{target}_color_hex"
+        initial_color_attr = "bg_color_hex" if target == "background" else f"{target}_color_hex"
         initial_color = getattr(self, initial_color_attr, self.line_color_hex)
-        color = QColorDialog.getColor(initial=QColor(initial_color))
+        color = QColorDialog.getColor(initial=qcolor(initial_color))
         
         if color.isValid():
             hex_color = color.name()
@@ -1211,23 +2300,33 @@ class PlottingApp(QMainWindow):
                 if self.selected_artist_info and (ds_index := self.selected_artist_info['dataset_index']) < len(self.datasets):
                     ds = self.datasets[ds_index]
                     ds['primary_color'] = hex_color
-                    ds['line_segment_colors'] = [hex_color] * (len(ds.get('x', [])) - 1)
+                    ds['line_segment_colors'] = segment_colors(hex_color, len(ds['x']))
                 else:
                     for ds in self.datasets:
                         ds['primary_color'] = hex_color
-                        ds['line_segment_colors'] = [hex_color] * (len(ds.get('x', [])) - 1)
+                        ds['line_segment_colors'] = segment_colors(hex_color, len(ds['x']))
             
             elif target == "point":
                 self.point_color_hex = hex_color
                 if self.selected_artist_info and (ds_index := self.selected_artist_info['dataset_index']) < len(self.datasets):
+                    targets = [ds_index]
                     if (point_index := self.selected_artist_info.get('point_index', -1)) != -1:
-                        self.datasets[ds_index]['colors'][point_index] = hex_color
+                        writable_column(self.datasets[ds_index], 'colors')[point_index] = hex_color
+                        self.update_table_colors(targets, point_index)
                     else:
-                        self.datasets[ds_index]['colors'] = [hex_color] * len(self.datasets[ds_index]['colors'])
+                        # 就地寫入：label_specs 保存的是同一個顏色陣列，之後平移或縮放新建的標籤也會使用新顏色
+                        writable_column(self.datasets[ds_index], 'colors')[:] = hex_color
+                        self.update_table_colors(targets)
                 else:
+                    targets = range(len(self.datasets))
                     for ds in self.datasets:
-                        ds['colors'] = [hex_color] * len(ds.get('colors', []))
-                self.update_table()
+                        writable_column(ds, 'colors')[:] = hex_color
+                    self.update_table_colors()
+                if self.blit_background is not None:
+                    # 點顏色只影響既有的散佈點、長條與標籤，直接就地套用並 blit，不重建圖表
+                    self.update_button_color()
+                    self.apply_point_colors(targets)
+                    return
             
             elif target == "border":
                 self.border_color_hex = hex_color
@@ -1237,8 +2336,13 @@ class PlottingApp(QMainWindow):
                     for ds in self.datasets: ds['border_color'] = hex_color
             
             else:
+                # 背景、軸標籤與格線顏色已包含在 PlotLabel 中，不需遞增 data_version；選到相同顏色時不會重繪
                 setattr(self, initial_color_attr, hex_color)
+                self.update_button_color()
+                self.update_plot()
+                return
 
+            self.data_version += 1
             self.update_button_color()
             self.update_plot()
 
@@ -1246,84 +2350,99 @@ class PlottingApp(QMainWindow):
         for dataset in self.datasets:
             dataset['primary_color'] = new_color
             if update_all:
-                dataset['colors'] = [new_color] * len(dataset.get('colors', []))
-                dataset['line_segment_colors'] = [new_color] * (len(dataset.get('x', [])) - 1)
-        if update_all: self.update_table()
+                dataset['colors'] = np.full(len(dataset['colors']), new_color, dtype=COLOR_DTYPE)
+                dataset['line_segment_colors'] = segment_colors(new_color, len(dataset['x']))
+        if update_all: self.update_table_colors()
+        self.data_version += 1
         self.update_plot()
 
     def pick_color_for_cell(self, row, col):
-        if not self.is_updating_table and col > 0 and (col % 2 == 0):
+        if self.table_update_depth == 0 and col > 0 and (col % 2 == 0):
             dataset_index = (col // 2) - 1
             if dataset_index >= len(self.datasets): return
             color = QColorDialog.getColor()
             if color.isValid() and row < len(self.datasets[dataset_index]['colors']):
                 hex_color = color.name()
-                self.datasets[dataset_index]['colors'][row] = hex_color
-                self.data_table.item(row, col).setBackground(QColor(hex_color))
-                self.update_plot()
+                writable_column(self.datasets[dataset_index], 'colors')[row] = hex_color
+                self.update_table_colors([dataset_index], row)
+                # 顏色已直接套用到畫面上的 artist，不需遞增 data_version 觸發重建
+                self.apply_point_colors([dataset_index])
                 
     def update_data_from_table(self):
-        if self.is_updating_table: return
+        """ 表格的修改已寫入 self.datasets 後，標記數據變更並重繪。 """
+        self.row_search_blobs = None
+        if self.table_update_depth: return
         self.data_source = 'manual'
-        
-        try:
-            x_data_str = [self.data_table.item(r, 0).text().strip() if self.data_table.item(r, 0) else "0" for r in range(self.data_table.rowCount())]
-            x_data = [float(x) if x.replace('.', '', 1).lstrip('-').isdigit() else x for x in x_data_str]
-        except (ValueError, AttributeError): x_data = x_data_str
-
-        new_datasets = []
-        for i in range((self.data_table.columnCount() - 1) // 2):
-            y_col, c_col = 1 + i * 2, 2 + i * 2
-            y_data_str = [self.data_table.item(r, y_col).text().strip() if self.data_table.item(r, y_col) else "0" for r in range(self.data_table.rowCount())]
-            y_data = [float(y) if y.replace('.', '', 1).lstrip('-').isdigit() else y for y in y_data_str]
-            colors = [self.data_table.item(r, c_col).background().color().name() if self.data_table.item(r, c_col) else self.point_color_hex for r in range(self.data_table.rowCount())]
-            
-            old_ds = self.datasets[i] if i < len(self.datasets) else {}
-            new_ds = old_ds.copy()
-            new_ds.update({
-                'name': self.data_table.horizontalHeaderItem(y_col).text().replace("Y: ", ""),
-                'x': x_data[:len(y_data)], 'y': y_data, 'colors': colors, 
-                'primary_color': old_ds.get('primary_color', self.line_color_hex)
-            })
-            new_datasets.append(new_ds)
-        
-        self.datasets = new_datasets
-        self.original_datasets = [ds.copy() for ds in self.datasets]
+        self.original_datasets_dirty = True
+        self.data_version += 1
         self.update_plot()
         self.update_series_combo() 
 
+    def sort_datasets(self, column, order):
+        """ 依表格某一欄的值重新排列所有數據集的列；數值欄位依數值排序，其餘依文字排序。 """
+        ds, key = self.table_model.cell(0, column)
+        if ds is None:
+            return
+        values = ds[key]
+        if key == 'colors' or not ds[f'numeric_{key}']:
+            values = values.astype(str)
+        rows = np.argsort(values, kind='stable')
+        if order == Qt.DescendingOrder:
+            rows = rows[::-1]
+        for other in self.datasets:
+            # 長度不同的數據集：排序欄範圍內的列依新順序排列，多出的列保留在最後
+            n = len(other['x'])
+            other_rows = np.concatenate((rows[rows < n], np.arange(len(rows), n))) if n != len(rows) else rows
+            for k in ('x', 'y', 'colors'):
+                other[k] = other[k][other_rows]
+
     def on_table_sort(self, column, order):
+        if column < 0:
+            return
+        if self.original_datasets_dirty:
+            self.original_datasets = snapshot_datasets(self.datasets)
+            self.original_datasets_dirty = False
         if self.last_sort_info['col'] == column: self.last_sort_info['count'] += 1
         else: self.last_sort_info = {'col': column, 'count': 1}
         if self.last_sort_info['count'] >= 3:
             self.data_table.horizontalHeader().setSortIndicator(-1, Qt.AscendingOrder)
-            self.datasets = [ds.copy() for ds in self.original_datasets]
+            # 快照直接交還給數據集而不再複製；下一次排序時才重新建立快照
+            self.datasets, self.original_datasets = self.original_datasets, []
+            self.original_datasets_dirty = True
+            self.data_version += 1
             self.update_table(); self.update_plot(); self.last_sort_info['col'] = -1
             return
+        self.sort_datasets(column, order)
+        self.update_table()
         self.update_data_from_table()
+        # 排序只改變列順序，保留排序前的快照供第三次點擊還原
+        self.original_datasets_dirty = False
 
     def update_data_from_file_input(self):
-        if self.excel_data is None: return
+        if not self._col_arrays: return
         self.data_source = 'file'
         x_col = self.x_col_combo.currentText()
         y_cols = [item.text() for item in self.y_col_list.selectedItems()]
         self.annotation_positions.clear()
         self.datasets = []
+        self.data_version += 1
         if not x_col or not y_cols: self.update_plot(); self.update_table(); return
         try:
-            x_data = self.excel_data[x_col].tolist()
+            # 直接從載入時建立的欄位陣列快取取值，避免每次選擇變更都重新存取 DataFrame
+            x_data, numeric_x, integral_x = self._col_arrays[x_col]
             if not self.x_label_input.text(): self.x_label_input.setText(x_col)
             for y_col in y_cols:
-                y_data = self.excel_data[y_col].tolist()
+                y_data, numeric_y, integral_y = self._col_arrays[y_col]
                 n = len(y_data)
                 self.datasets.append({
-                    'name': y_col, 'x': x_data[:n], 'y': y_data, 
-                    'colors': [self.point_color_hex] * n, 'primary_color': self.line_color_hex, 
-                    'line_segment_colors': [self.line_color_hex] * (n - 1), 'marker': '圓形', 
+                    'name': y_col, 'x': x_data[:n], 'y': y_data, 'colors': np.full(n, self.point_color_hex, dtype=COLOR_DTYPE),
+                    'numeric_x': numeric_x, 'numeric_y': numeric_y, 'integral_x': integral_x, 'integral_y': integral_y,
+                    'primary_color': self.line_color_hex, 
+                    'line_segment_colors': segment_colors(self.line_color_hex, n), 'marker': '圓形', 
                     'border_color': '#000000', 'linewidth': self.line_width_spinbox.value(),
                     'linestyle': self.linestyle_combo.currentText()
                 })
-            self.original_datasets = [ds.copy() for ds in self.datasets]
+            self.original_datasets_dirty = True
             self.y_label_input.setText(y_cols[0] if len(y_cols) == 1 else "數據值")
             self.update_plot(); self.update_table()
             self.update_series_combo()
@@ -1332,139 +2451,201 @@ class PlottingApp(QMainWindow):
 
     def load_excel_file(self):
         filename, _ = QFileDialog.getOpenFileName(self, "選擇檔案", "", "Excel/CSV (*.xlsx *.xls *.csv)")
-        if filename:
-            try:
-                ext = os.path.splitext(filename)[1].lower()
-                if ext in ['.xlsx', '.xls']: self.excel_data = pd.read_excel(filename)
-                elif ext == '.csv':
-                    try: self.excel_data = pd.read_csv(filename, encoding='utf-8')
-                    except UnicodeDecodeError: self.excel_data = pd.read_csv(filename, encoding='big5')
-                
-                cols = self.excel_data.columns.tolist()
-                self.x_col_combo.clear(); self.y_col_list.clear()
-                self.x_col_combo.addItems(cols); self.y_col_list.addItems(cols)
-                if len(cols) >= 2: self.x_col_combo.setCurrentIndex(0); self.y_col_list.setCurrentRow(1)
-                self.data_source = 'file'
-            except Exception as e: QMessageBox.critical(self, "讀取錯誤", f"無法讀取檔案：{e}")
+        if filename and self.load_worker is None:
+            # 讀檔與欄位轉換在背景執行緒進行，完成後由訊號回到主執行緒更新介面
+            self.load_worker = FileLoadWorker(filename)
+            self.load_worker.signals.finished.connect(self.on_file_loaded)
+            self.load_worker.signals.failed.connect(self.on_file_load_failed)
+            self.load_excel_btn.setEnabled(False)
+            QApplication.setOverrideCursor(Qt.CursorShape.WaitCursor)
+            QThreadPool.globalInstance().start(self.load_worker)
+
+    def finish_file_load(self):
+        self.load_worker = None
+        self.load_excel_btn.setEnabled(True)
+        QApplication.restoreOverrideCursor()
+
+    def on_file_loaded(self, col_arrays):
+        self.finish_file_load()
+        try:
+            self._col_arrays = col_arrays
+            cols = list(col_arrays)
+            self.x_col_combo.clear(); self.y_col_list.clear()
+            self.x_col_combo.addItems(cols); self.y_col_list.addItems(cols)
+            if len(cols) >= 2: self.x_col_combo.setCurrentIndex(0); self.y_col_list.setCurrentRow(1)
+            self.data_source = 'file'
+        except Exception as e: QMessageBox.critical(self, "讀取錯誤", f"無法讀取檔案：{e}")
+
+    def on_file_load_failed(self, message):
+        self.finish_file_load()
+        QMessageBox.critical(self, "讀取錯誤", f"無法讀取檔案：{message}")
+
+    def new_dataset(self, name, x, y):
+        """ 以目前的顏色與線條設定建立新的數據集。 """
+        return {'name': name, **dataset_columns(x, y, np.full(len(y), self.point_color_hex, dtype=COLOR_DTYPE)),
+                'primary_color': self.line_color_hex, 'line_segment_colors': segment_colors(self.line_color_hex, len(y)),
+                'marker': '圓形', 'border_color': '#000000', 'linewidth': self.line_width_spinbox.value(),
+                'linestyle': self.linestyle_combo.currentText()}
 
     def add_row(self):
         if not self.datasets:
-            self.datasets.append({'name': '數據1', 'x': [0], 'y': [0], 'colors': [self.point_color_hex], 'primary_color': self.line_color_hex, 'line_segment_colors': [], 'marker': '圓形', 'border_color': '#000000', 'linewidth': self.line_width_spinbox.value(), 'linestyle': self.linestyle_combo.currentText()})
+            self.datasets.append(self.new_dataset('數據1', [0], [0]))
         else:
             for ds in self.datasets:
-                last_x = ds['x'][-1] if ds['x'] and isinstance(ds['x'][-1], (int, float)) else len(ds['x']) -1
-                ds['x'].append(last_x + 1); ds['y'].append(0); ds['colors'].append(self.point_color_hex)
-        self.original_datasets = [ds.copy() for ds in self.datasets]
+                last_x = ds['x'][-1] if len(ds['x']) and ds['numeric_x'] else len(ds['x']) -1
+                # 新增的 x 與 y 皆為數值，不改變欄位原本的數值型態旗標，直接附加而不必重新判斷整欄的型態
+                ds['x'] = np.append(ds['x'], last_x + 1)
+                ds['y'] = np.append(ds['y'], 0)
+                ds['colors'] = np.append(ds['colors'], self.point_color_hex)
+        self.original_datasets_dirty = True
+        self.data_version += 1
         self.update_table(); self.update_plot()
         self.update_series_combo()
 
     def remove_row(self):
-        rows = sorted(list(set(index.row() for index in self.data_table.selectedIndexes())), reverse=True)
-        if not rows: return
-        for row in rows:
-            for ds in self.datasets:
-                if row < len(ds['x']):
-                    for key in ['x', 'y', 'colors']: 
-                        if row < len(ds[key]):
-                            del ds[key][row]
-        self.original_datasets = [ds.copy() for ds in self.datasets]
+        # 由選取範圍直接取得列號；selectedIndexes() 會為每一列的每一欄各建立一個索引物件
+        if not (ranges := list(self.data_table.selectionModel().selection())): return
+        rows = np.unique(np.concatenate([np.arange(r.top(), r.bottom() + 1) for r in ranges]))
+        for ds in self.datasets:
+            # 每個數據集只建立一次保留列的遮罩，三個欄位共用 (np.delete 每次呼叫都會重新建立遮罩)
+            keep = np.ones(len(ds['x']), dtype=bool)
+            keep[rows[rows < len(keep)]] = False
+            for key in ['x', 'y', 'colors']:
+                ds[key] = ds[key][keep]
+        self.original_datasets_dirty = True
+        self.data_version += 1
         self.update_table(); self.update_plot()
         self.update_series_combo()
 
     def move_row(self, direction):
-        if not (sel := self.data_table.selectedIndexes()): return
-        row = sel[0].row()
+        if not (ranges := list(self.data_table.selectionModel().selection())): return
+        row = min(r.top() for r in ranges)
         new_row = row + direction
-        if not (0 <= new_row < self.data_table.rowCount()): return
+        if not (0 <= new_row < self.table_model.rowCount()): return
         
-        self.is_updating_table = True
         for ds in self.datasets:
             for key in ['x', 'y', 'colors']:
                 if row < len(ds[key]) and new_row < len(ds[key]):
-                    ds[key][row], ds[key][new_row] = ds[key][new_row], ds[key][row]
-        self.original_datasets = [ds.copy() for ds in self.datasets]
-        self.update_table()
-        self.data_table.selectRow(new_row)
-        self.is_updating_table = False
+                    # 唯讀的載入欄位陣列先複製一次，之後皆為 O(1) 就地交換
+                    arr = writable_column(ds, key)
+                    arr[[row, new_row]] = arr[[new_row, row]]
+        # 不在每次移動時重建快照，待排序實際需要時才建立
+        self.original_datasets_dirty = True
+        self.data_version += 1
+        with self.table_batch():
+            self.update_table()
+            self.data_table.selectRow(new_row)
         self.update_plot()
 
     def move_row_up(self): self.move_row(-1)
     def move_row_down(self): self.move_row(1)
         
     def clear_plot(self):
-        self.datasets, self.original_datasets, self.excel_data = [], [], None
+        self.datasets, self.original_datasets = [], []
+        self.original_datasets_dirty = False
+        self.artist_cache = {}
+        self.smooth_cache.clear()
+        self._col_arrays = {}
         self.data_source, self.annotation_positions = 'manual', {}
+        self.data_version += 1
         for w in [self.title_input, self.x_label_input, self.y_label_input, self.x_col_combo, self.y_col_list]: w.clear()
         self.update_table(); self.update_plot()
         self.update_series_combo()
 
+    def closeEvent(self, event):
+        self.smooth_executor.shutdown(wait=False, cancel_futures=True)
+        super().closeEvent(event)
+
     # <--- 修正 4: 修正 findChildren 的呼叫方式 (START) --->
     def get_settings(self):
         """
         將所有目前的 UI 設定收集到一個字典中。
         此版本修正了 findChildren 的呼叫方式以避免 TypeError。
         """
-        settings = {}
-        widget_types = (QLineEdit, QSpinBox, QDoubleSpinBox, QCheckBox, QComboBox)
-        
-        all_widgets = []
-        for widget_type in widget_types:
-            # 逐一為每種類型呼叫 findChildren，並將結果收集起來
-            all_widgets.extend(self.findChildren(widget_type))
-
-        for widget in all_widgets:
-            if not widget.objectName():
-                continue
-
-            obj_name = widget.objectName()
-            # 根據類別名稱來決定如何獲取數值
-            class_name = widget.metaObject().className()
-
-            if class_name == 'QLineEdit':
-                settings[obj_name] = widget.text()
-            elif class_name in ['QSpinBox', 'QDoubleSpinBox']:
-                settings[obj_name] = widget.value()
-            elif class_name == 'QCheckBox':
-                settings[obj_name] = widget.isChecked()
-            elif class_name == 'QComboBox':
-                settings[obj_name] = widget.currentText()
-        
-        settings.update({k: getattr(self, k) for k in dir(self) if k.endswith("_hex")})
+        dispatch = self.settings_dispatch()
+        # 元件值自上次讀取後沒有任何變動時，直接沿用快取的結果
+        if self.settings_cache_version != self.settings_version:
+            self.settings_cache = {name: getter() for name, (getter, _) in dispatch.items()}
+            self.settings_cache_version = self.settings_version
+        settings = dict(self.settings_cache)
+        settings.update({k: getattr(self, k) for k in self.hex_setting_names})
         settings["datasets_styles"] = [{"marker": d.get('marker'), "linewidth": d.get('linewidth'), "linestyle": d.get('linestyle')} for d in self.datasets]
         settings["x_tick_rotation"] = self.x_tick_rotation_spinbox.value()
         settings["y_tick_rotation"] = self.y_tick_rotation_spinbox.value()
         return settings
     # <--- 修正 4: (END) --->
 
+    def settings_dispatch(self):
+        """
+        建立並快取 {objectName: (getter, setter)} 對照表，取代每個設定鍵都呼叫一次 findChild 搜尋整個元件樹。
+        """
+        if self.settings_widgets is not None:
+            return self.settings_widgets
+        # dir(self) 會列出 QMainWindow 的數百個屬性，顏色屬性名稱只需收集一次
+        self.hex_setting_names = [k for k in dir(self) if k.endswith("_hex")]
+        self.settings_signal_widgets = [self.x_tick_rotation_spinbox, self.y_tick_rotation_spinbox]
+        dispatch = {}
+        widget_types = (QLineEdit, QSpinBox, QDoubleSpinBox, QCheckBox, QComboBox)
+        # 只走訪一次元件樹，再依類型篩選，不為每種類型各呼叫一次 findChildren
+        for widget in self.findChildren(QWidget):
+            if not isinstance(widget, widget_types):
+                continue
+            obj_name = widget.objectName()
+            # 略過未命名元件與 Qt 內部元件 (例如 spinbox 內含的 qt_spinbox_lineedit)
+            if not obj_name or obj_name.startswith('qt_') or obj_name in dispatch:
+                continue
+            self.settings_signal_widgets.append(widget)
+            if isinstance(widget, QLineEdit):
+                dispatch[obj_name] = (widget.text, widget.setText)
+                widget.textChanged.connect(self.mark_settings_dirty)
+            elif isinstance(widget, (QSpinBox, QDoubleSpinBox)):
+                dispatch[obj_name] = (widget.value, widget.setValue)
+                widget.valueChanged.connect(self.mark_settings_dirty)
+            elif isinstance(widget, QCheckBox):
+                dispatch[obj_name] = (widget.isChecked, widget.setChecked)
+                widget.toggled.connect(self.mark_settings_dirty)
+            else:
+                dispatch[obj_name] = (widget.currentText, lambda v, w=widget: self.set_combo_text(w, v))
+                widget.currentTextChanged.connect(self.mark_settings_dirty)
+        self.settings_widgets = dispatch
+        return dispatch
+
+    def set_combo_text(self, combo, text):
+        """ 選取文字為 text 的項目 (找不到時不變)；固定選項的下拉選單以預建索引表查詢。 """
+        if (index_map := self.combo_indices.get(combo)) is not None:
+            idx = index_map.get(text, -1)
+        else:
+            idx = combo.findText(text)
+        if idx != -1:
+            combo.setCurrentIndex(idx)
+
+    def mark_settings_dirty(self):
+        self.settings_version += 1
+
     def set_settings(self, s):
         """
         從字典中應用設定至 UI。
         """
-        self.is_updating_ui = True
-        try:
+        dispatch = self.settings_dispatch()
+        # 套用期間暫停元件訊號，最後由 toggle_plot_settings 統一排程一次重繪
+        with self.batched_updates(self.settings_signal_widgets):
             for k, v in s.items():
-                widget = self.findChild(QWidget, k)
-                if widget:
-                    class_name = widget.metaObject().className()
-                    if class_name == 'QLineEdit':
-                        widget.setText(v)
-                    elif class_name in ['QSpinBox', 'QDoubleSpinBox']:
-                        widget.setValue(v)
-                    elif class_name == 'QCheckBox':
-                        widget.setChecked(v)
-                    elif class_name == 'QComboBox':
-                        if (idx := widget.findText(v)) != -1:
-                            widget.setCurrentIndex(idx)
+                if accessors := dispatch.get(k):
+                    getter, setter = accessors
+                    # 值未改變的元件不呼叫 setter，避免觸發多餘的訊號
+                    if getter() != v:
+                        setter(v)
                 elif k.endswith("_hex"):
                     setattr(self, k, v)
 
-            if "x_tick_rotation" in s: self.x_tick_rotation_spinbox.setValue(s["x_tick_rotation"])
-            if "y_tick_rotation" in s: self.y_tick_rotation_spinbox.setValue(s["y_tick_rotation"])
+            for key, spinbox in (("x_tick_rotation", self.x_tick_rotation_spinbox), ("y_tick_rotation", self.y_tick_rotation_spinbox)):
+                if key in s and spinbox.value() != s[key]: spinbox.setValue(s[key])
             if "datasets_styles" in s:
                 for i, style in enumerate(s["datasets_styles"]):
                     if i < len(self.datasets): self.datasets[i].update(style)
-        finally:
-            self.is_updating_ui = False
+                self.data_version += 1
+        # 訊號被暫停，需手動讓 get_settings 的快取失效
+        self.mark_settings_dirty()
         self.update_button_color()
         self.toggle_plot_settings()
 
@@ -1472,22 +2653,45 @@ class PlottingApp(QMainWindow):
         container = QFrame()
         container.setFrameShape(QFrame.StyledPanel)
         layout = QVBoxLayout(container); layout.setContentsMargins(5, 5, 5, 5)
-        btn = QPushButton(f"▼ {title}")
+        # 展開與摺疊時的標題文字只組合一次，切換時直接取用
+        shown_text, hidden_text = f"▼ {title}", f"▶ {title}"
+        btn = QPushButton(shown_text)
         btn.setStyleSheet("text-align: left; font-weight: bold; border: none; background-color: #e0e0e0;")
         content = QWidget(); content.setLayout(content_layout)
-        btn.clicked.connect(lambda: (content.setVisible(not content.isVisible()), btn.setText(f"{'▼' if content.isVisible() else '▶'} {title}")))
+        btn.setProperty("content_widget", content)
+        btn.setProperty("shown_text", shown_text); btn.setProperty("hidden_text", hidden_text)
+        btn.clicked.connect(self.toggle_collapsible)
         layout.addWidget(btn); layout.addWidget(content)
+        # 保留標題按鈕與內容元件的參考，之後展開面板時不必以 findChild 搜尋
+        container.toggle_button, container.content_widget = btn, content
         if obj_name: container.setObjectName(obj_name)
         return container
+
+    def toggle_collapsible(self):
+        """ 所有摺疊面板共用的切換槽函式，由 sender() 取得被點擊的標題按鈕。 """
+        btn = self.sender()
+        content = btn.property("content_widget")
+        visible = not content.isVisible()
+        content.setVisible(visible)
+        btn.setText(btn.property("shown_text" if visible else "hidden_text"))
         
     def highlight_widget(self, widget, duration=1000):
-        original_style = widget.styleSheet()
+        # 重複高亮時保留最初的樣式，避免把高亮後的樣式當成原始樣式
+        original_style = self.highlighted_widgets.setdefault(widget, widget.styleSheet())
         widget.setStyleSheet(original_style + " QFrame { border: 2px solid #add8e6; }")
-        QTimer.singleShot(duration, lambda: widget.setStyleSheet(original_style))
+        QTimer.singleShot(duration, lambda: self.clear_highlight(widget))
+
+    def clear_highlight(self, widget):
+        """ 還原單一 widget 的原始樣式。 """
+        if (original_style := self.highlighted_widgets.pop(widget, None)) is not None:
+            try:
+                widget.setStyleSheet(original_style)
+            except RuntimeError:
+                pass
     
     def clear_all_highlights(self):
         """ 清除所有 widget 上的高亮效果。 """
-        for widget, original_style in list(self.highlighted_widgets):
+        for widget, original_style in self.highlighted_widgets.items():
             try:
                 widget.setStyleSheet(original_style)
             except RuntimeError:
@@ -1497,35 +2701,62 @@ class PlottingApp(QMainWindow):
     def table_key_press_event(self, event):
         if event.matches(QKeySequence.StandardKey.Copy): self.copy_data()
         elif event.matches(QKeySequence.StandardKey.Paste): self.paste_data()
-        else: QTableWidget.keyPressEvent(self.data_table, event)
+        else: QTableView.keyPressEvent(self.data_table, event)
     
     def copy_data(self):
-        if not (sel := self.data_table.selectedRanges()): return
-        text = '\n'.join(['\t'.join([self.data_table.item(r, c).text() if self.data_table.item(r, c) else '' for c in range(sel[0].leftColumn(), sel[0].rightColumn() + 1)]) for r in range(sel[0].topRow(), sel[0].bottomRow() + 1)])
-        QApplication.clipboard().setText(text)
+        if not (sel := list(self.data_table.selectionModel().selection())): return
+        top, left = min(rng.top() for rng in sel), min(rng.left() for rng in sel)
+        bottom, right = max(rng.bottom() for rng in sel), max(rng.right() for rng in sel)
+        # 每一欄的文字整段一次取得；多個選取範圍時以外框為準，未選取的儲存格留空
+        selected = np.zeros((bottom - top + 1, right - left + 1), dtype=bool)
+        for rng in sel:
+            selected[rng.top() - top:rng.bottom() - top + 1, rng.left() - left:rng.right() - left + 1] = True
+        columns = [np.where(selected[:, c - left], self.table_model.column_text(c, top, bottom + 1), '') for c in range(left, right + 1)]
+        QApplication.clipboard().setText('\n'.join(join_columns(columns, '\t').tolist()))
 
     def paste_data(self):
-        text, sel = QApplication.clipboard().text(), self.data_table.selectedIndexes()
+        text, sel = QApplication.clipboard().text(), self.data_table.selectionModel().selectedIndexes()
         start_row = sel[0].row() if sel else 0
         start_col = sel[0].column() if sel else 0
         lines = text.strip('\n').split('\n')
-        self.is_updating_table = True
-        for i, line in enumerate(lines):
-            row = start_row + i
-            if row >= self.data_table.rowCount(): self.data_table.insertRow(row)
-            for j, field in enumerate(line.split('\t')):
-                if (col := start_col + j) < self.data_table.columnCount(): self.data_table.setItem(row, col, QTableWidgetItem(field.strip()))
-        self.is_updating_table = False; self.update_data_from_table()
+        if not self.datasets:
+            self.datasets.append(self.new_dataset('數據1', [], []))
+        # 一次將所有數據集補足所需的列數 (以 0 填入)，不逐列擴充
+        total_rows = start_row + len(lines)
+        for ds in self.datasets:
+            if (missing := total_rows - len(ds['x'])) > 0:
+                ds['x'] = np.append(ds['x'], np.zeros(missing))
+                ds['y'] = np.append(ds['y'], np.zeros(missing))
+                ds['colors'] = np.append(ds['colors'], np.full(missing, self.point_color_hex, dtype=COLOR_DTYPE))
+        col_count = self.table_model.columnCount()
+        self.set_cell_texts([(row, col, field.strip()) for row, line in enumerate(lines, start_row)
+                             for col, field in enumerate(line.split('\t'), start_col) if col < col_count])
+        self.update_table()
+        self.update_data_from_table()
         
     def filter_table(self, text):
-        for r in range(self.data_table.rowCount()):
-            self.data_table.setRowHidden(r, text.lower() not in ''.join([self.data_table.item(r, c).text().lower() for c in range(self.data_table.columnCount()) if self.data_table.item(r, c)]))
+        if self.row_search_blobs is None:
+            self.row_search_blobs = self.table_model.search_texts()
+        # 一次向量化比對所有列，之後只對顯示狀態改變的列呼叫 setRowHidden
+        hidden = np.char.find(self.row_search_blobs, text.lower()) < 0
+        previous = self.hidden_rows
+        if previous is None or len(previous) != len(hidden):
+            previous = np.zeros(len(hidden), dtype=bool)
+        self.hidden_rows = hidden
+        if not len(changed := np.flatnonzero(hidden != previous)):
+            return
+        self.data_table.setUpdatesEnabled(False)
+        try:
+            for r in changed:
+                self.data_table.setRowHidden(int(r), bool(hidden[r]))
+        finally:
+            self.data_table.setUpdatesEnabled(True)
 
     def save_template(self):
         filename, _ = QFileDialog.getSaveFileName(self, "儲存範本", "", "JSON (*.json)")
         if filename:
             try:
-                with open(filename, 'w', encoding='utf-8') as f: json.dump(self.get_settings(), f, ensure_ascii=False, indent=4)
+                with open(filename, 'w', encoding='utf-8') as f: json.dump(self.get_settings(), f, ensure_ascii=False, separators=(',', ':'))
                 QMessageBox.information(self, "成功", "範本已儲存。")
             except Exception as e: QMessageBox.critical(self, "錯誤", f"無法儲存檔案：{e}")
 